@@ -1,35 +1,71 @@
 import argparse
 import json
+import time
 from pathlib import Path
 
+from ragenetics.pipeline.runlog import GROUP_FIELDS, update
 
-def main(path: str):
+
+def _fmt(v) -> str:
+    if v is None:
+        return "-"
+    return f"{v:.3f}" if isinstance(v, float) else str(v)
+
+
+def main(paths, checkpoint=None, workers=None, by=GROUP_FIELDS, as_json=False):
     """
-    Read a run log (JSONL) and summarize ε-spending statistics.
+    Summarize ε spending and latency from run logs, reading only new lines
+    when a checkpoint is given.
     """
-    p = Path(path)
-    if not p.exists():
-        print("No run log found:", path)
+    t = time.perf_counter()
+    stats = update([Path(p) for p in paths], checkpoint=Path(checkpoint) if checkpoint else None, workers=workers)
+    elapsed = time.perf_counter() - t
+
+    if as_json:
+        print(json.dumps({"total": stats.summary(by=()), "groups": stats.summary(by=by)}))
+        return
+    if not stats.runs:
+        print("No ε entries found.")
         return
 
-    spent = []
-    for line in p.read_text(encoding="utf-8").splitlines():
-        try:
-            obj = json.loads(line)
-            if "eps_spent" in obj:
-                spent.append(obj["eps_spent"])
-        except Exception:
-            # Ignore malformed lines
-            pass
-
-    if spent:
-        print(f"Runs: {len(spent)} | mean ε: {sum(spent) / len(spent):.2f} | max ε: {max(spent):.2f}")
+    total = stats.summary(by=())[0]
+    if total["eps_spent_mean"] is None:
+        print(f"Runs: {total['runs']} | No ε entries found.")
     else:
-        print("No ε entries found.")
+        print(
+            f"Runs: {total['runs']} | mean ε: {total['eps_spent_mean']:.2f} | "
+            f"p99 ε: {total['eps_spent_p99']:.2f} | max ε: {total['eps_spent_max']:.2f}"
+        )
+    cols = list(by) + ["runs", "eps_spent_mean", "eps_spent_p50", "eps_spent_p99", "latency_s_p50", "latency_s_p99", "slo_hit_rate"]
+    print("\t".join(cols))
+    for row in stats.summary(by=by):
+        print("\t".join(_fmt(row[c]) for c in cols))
+    if stats.malformed:
+        print(f"Skipped {stats.malformed} malformed lines")
+    print(f"({elapsed:.2f}s)")
+
+
+def _group_fields(value: str):
+    fields = [f for f in value.split(",") if f]
+    bad = [f for f in fields if f not in GROUP_FIELDS]
+    if bad:
+        raise argparse.ArgumentTypeError(f"unknown group field(s) {', '.join(bad)}; choose from {','.join(GROUP_FIELDS)}")
+    return fields
 
 
 if __name__ == "__main__":
-    ap = argparse.ArgumentParser(description="Summarize epsilon spending from a run log.")
-    ap.add_argument("--log", default="runs/last_run.jsonl", help="Path to run log JSONL file")
+    ap = argparse.ArgumentParser(description="Summarize epsilon spending from run logs.")
+    ap.add_argument(
+        "--log",
+        nargs="+",
+        default=["runs/last_run.jsonl"],
+        help="Run log JSONL file(s) or directories; rotated .N / .gz segments are included",
+    )
+    ap.add_argument("--checkpoint", help="Checkpoint file; re-runs only read lines appended since")
+    ap.add_argument("--workers", type=int, default=None, help="Processes for reading segments (0 = in-process)")
+    ap.add_argument(
+        "--by", type=_group_fields, default=list(GROUP_FIELDS), help="Group fields: any of config,scheme,class"
+    )
+    ap.add_argument("--json", action="store_true", help="Print the summary as JSON (for dashboards)")
     args = ap.parse_args()
-    main(args.log)
+    main(args.log, args.checkpoint, args.workers, args.by, args.json)
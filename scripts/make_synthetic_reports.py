@@ -1,39 +1,36 @@
 import argparse
-import random
-import os
+import time
 from pathlib import Path
 
-# Sample HPO terms, genes, and variants
-HPO = [
-    ("HP:0004322", "Short stature"),
-    ("HP:0001250", "Seizures"),
-    ("HP:0002721", "Recurrent infections"),
-    ("HP:0002027", "Diarrhea"),
-    ("HP:0001537", "Abnormality of hair morphology"),
-]
-
-GENES = ["CFTR", "BRCA1", "BRCA2", "FBN1", "PAH", "PKD1", "COL1A1"]
-VARIANTS = ["c.1521_1523delCTT (p.Phe508del)", "c.68_69delAG", "c.35delG", "c.1582G>A"]
-
-TEMPLATE = (
-    "Patient exhibits {hpo1}, {hpo2}. "
-    "Genetic testing reveals a variant in {gene}: {var}. "
-    "Family history is notable. Recommend correlation with phenotype and ACMG/AMP criteria."
-)
+from ragenetics.genetics.synthetic import generate_corpus
 
 if __name__ == "__main__":
-    ap = argparse.ArgumentParser(description="Generate synthetic de-identified genetic reports.")
-    ap.add_argument("--out", default="data/toy_reports", help="Output directory for reports")
-    ap.add_argument("--n", type=int, default=20, help="Number of synthetic reports to generate")
+    ap = argparse.ArgumentParser(description="Generate sharded synthetic de-identified genetic reports.")
+    ap.add_argument("--out", default="data/synthetic_reports", help="Output directory for report shards")
+    ap.add_argument("--n", type=int, default=100000, help="Number of synthetic reports to generate")
+    ap.add_argument("--shard-size", type=int, default=50000, help="Reports per shard file")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 0 = in-process)")
+    ap.add_argument("--seed", type=int, default=0, help="Corpus seed (each shard derives its own stream)")
+    ap.add_argument("--vocab", type=int, default=20000, help="Narrative vocabulary size")
+    ap.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for narrative words")
+    ap.add_argument("--dup-rate", type=float, default=0.02, help="Fraction of near-duplicate reports")
+    ap.add_argument("--no-compress", action="store_true", help="Write plain .jsonl instead of .jsonl.gz")
     args = ap.parse_args()
 
-    os.makedirs(args.out, exist_ok=True)
-
-    for i in range(1, args.n + 1):
-        gene = random.choice(GENES)
-        var = random.choice(VARIANTS)
-        hpo1, hpo2 = random.sample([h[1] for h in HPO], 2)
-        text = TEMPLATE.format(hpo1=hpo1, hpo2=hpo2, gene=gene, var=var)
-        (Path(args.out) / f"report_{i:03d}.txt").write_text(text, encoding="utf-8")
+    t = time.perf_counter()
+    shards = generate_corpus(
+        Path(args.out),
+        args.n,
+        shard_size=args.shard_size,
+        workers=args.workers,
+        seed=args.seed,
+        vocab_size=args.vocab,
+        zipf=args.zipf,
+        dup_rate=args.dup_rate,
+        compress=not args.no_compress,
+    )
+    elapsed = time.perf_counter() - t
 
-    print(f"Wrote {args.n} synthetic reports to {args.out}")
+    total = sum(n for _, n in shards)
+    print(f"Wrote {total} synthetic reports in {len(shards)} shards to {args.out}")
+    print(f"{elapsed:.1f}s ({total / elapsed * 60:,.0f} reports/min)")
@@ -0,0 +1,7 @@
+import sys
+
+from ragenetics.cli import main
+
+# Kept for existing workflows; equivalent to `ragenetics eval`
+if __name__ == "__main__":
+    sys.exit(main(["eval", *sys.argv[1:]]))
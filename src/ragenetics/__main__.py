@@ -0,0 +1,5 @@
+import sys
+
+from ragenetics.cli import main
+
+sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Console entry point: `ragenetics run|build|eval|serve|load`.
+
+Only argparse is imported up front. Each subcommand imports what it needs
+when it runs, so `--help` and mock-provider runs stay fast to start.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+DEFAULT_INDEX = "data/embeddings/bm25_index.json"
+
+
+def _load_config(path: str) -> dict:
+    import yaml
+
+    with open(path, encoding="utf-8-sig") as f:
+        return yaml.safe_load(f)
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    """
+    Answer one query under DP and append a run log entry.
+    """
+    import json
+    import os
+    import random
+    import time
+    from pathlib import Path
+
+    from ragenetics.llm.local_openai import build_llm
+    from ragenetics.pipeline.builder import DEFAULT_LLM, build_engine, load_store_for, max_tokens_for
+
+    # Set deterministic random seed for reproducibility
+    random.seed(7)
+
+    cfg = _load_config(args.config)
+
+    # Ensure log directory exists
+    os.makedirs(Path(args.log).parent, exist_ok=True)
+
+    idx_path = Path(args.index)
+    if not idx_path.exists():
+        from loguru import logger
+
+        logger.warning(f"No vector index at {idx_path}; build it using `ragenetics build`")
+    store = load_store_for(cfg, idx_path)
+    llm = build_llm(cfg.get("llm") or DEFAULT_LLM)
+    engine = build_engine(cfg, store, llm)
+
+    # Generate answer under DP constraints, timing the first released token
+    t_start = time.perf_counter()
+    ttft = None
+    out = []
+    if args.stream:
+        print("=== ANSWER ===")
+    for tok, _ in engine.generate_stream(args.query, max_tokens=max_tokens_for(cfg), deadline=args.deadline):
+        if ttft is None:
+            ttft = time.perf_counter() - t_start
+        out.append(tok)
+        if args.stream:
+            print(tok, end=" ", flush=True)
+    latency = time.perf_counter() - t_start
+    # Estimated prompt tokens sent for this answer (the LLM was built for it)
+    input_tokens = getattr(llm, "input_tokens", None)
+    eps = float(engine.acc.spent)
+    text = " ".join(out).strip()
+    acceptance = getattr(engine, "acceptance_rate", None)
+    slo = engine.slo
+
+    if args.stream:
+        print()
+    print(f"ε spent: {round(eps, 3)}")
+    if acceptance is not None:
+        print(f"SVT acceptance: {acceptance:.2f}")
+    if slo is not None:
+        print(f"SLO {'hit' if slo['slo_hit'] else 'miss'}: {slo['elapsed_s']:.2f}s of {slo['deadline_s']:.2f}s")
+    if not args.stream:
+        print("\n=== ANSWER ===\n", text)
+
+    # Append run log entry
+    with open(args.log, "a", encoding="utf-8") as f:
+        f.write(
+            json.dumps(
+                {
+                    "query": args.query,
+                    "config": Path(args.config).stem,
+                    "scheme": cfg["privacy"]["scheme"],
+                    "eps_spent": eps,
+                    "ttft_s": ttft,
+                    "latency_s": latency,
+                    "tokens": len(out),
+                    "input_tokens": input_tokens,
+                    "svt_acceptance": acceptance,
+                    "voters_per_step": getattr(engine, "voters_per_step", None),
+                    "slo": slo,
+                    "hedging": engine.executor.summary() if engine.executor is not None else None,
+                }
+            )
+            + "\n"
+        )
+    return 0
+
+
+def cmd_build(args: argparse.Namespace) -> int:
+    """
+    Build a BM25 index from a directory of text/markdown files.
+    """
+    import json
+    import os
+    from pathlib import Path
+
+    from ragenetics.retrieval.chunking import read_and_chunk_dir
+    from ragenetics.retrieval.tokenizer import Tokenizer
+    from ragenetics.retrieval.vectorstore import LocalBM25Store
+
+    # Read and chunk documents, then build the index
+    docs = read_and_chunk_dir(Path(args.data))
+    store = LocalBM25Store(Tokenizer(stem=args.stem, stopwords=args.stopwords))
+    store.build(docs)
+
+    # Write serialized index to disk
+    os.makedirs(args.out, exist_ok=True)
+    idx_path = Path(args.out) / "bm25_index.json"
+    with open(idx_path, "w", encoding="utf-8") as f:
+        json.dump(store.serialize(), f, indent=2)
+
+    print(f"Wrote {idx_path}")
+
+    if args.dense:
+        from ragenetics.pipeline.builder import DENSE_INDEX_NAME
+        from ragenetics.retrieval.dense import DenseStore
+
+        dense_path = Path(args.out) / DENSE_INDEX_NAME
+        DenseStore.build(docs, dim=args.dense_dim, dtype=args.dense_dtype).save(dense_path)
+        print(f"Wrote {dense_path}")
+    return 0
+
+
+def cmd_eval(args: argparse.Namespace) -> int:
+    """
+    Evaluate configs over a question set in parallel.
+    """
+    from pathlib import Path
+
+    from ragenetics.pipeline.eval import expand_sweep, load_questions, run_eval, summarize, write_results
+
+    questions = load_questions(Path(args.questions))
+    configs = []
+    for path in args.config:
+        configs += expand_sweep(Path(path).stem, _load_config(path), args.sweep)
+
+    df = run_eval(questions, configs, Path(args.index), workers=args.workers)
+    out = write_results(df, Path(args.out))
+
+    print(summarize(df).to_string())
+    print(f"Wrote {len(df)} rows to {out}")
+    return 0
+
+
+def serve_handler(cfg: dict, store, executor=None):
+    """
+    HTTP request handler class for `ragenetics serve` (see cmd_serve).
+
+    Args:
+        cfg (dict): Pipeline config.
+        store: Warm retriever shared by all requests.
+        executor: Optional HedgedExecutor shared by all requests.
+    """
+    import json
+    from http.server import BaseHTTPRequestHandler
+
+    from ragenetics.pipeline.builder import build_engine, max_tokens_for
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/generate":
+                self.send_error(404)
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("body is not a JSON object")
+                query = str(body["query"])
+                max_tokens = int(body.get("max_tokens", max_tokens_for(cfg)))
+                deadline = body.get("deadline")
+                deadline = None if deadline is None else float(deadline)
+            except KeyError:
+                self.send_error(400, "expected JSON body with a 'query' field")
+                return
+            except (TypeError, ValueError) as e:
+                self.send_error(400, f"invalid request: {e}")
+                return
+
+            engine = build_engine(cfg, store, executor=executor)
+            steps = engine.generate_stream(query, max_tokens=max_tokens, deadline=deadline)
+
+            if body.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                for tok, eps in steps:
+                    self.wfile.write((json.dumps({"token": tok, "eps_spent": eps}) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+                return
+
+            toks = [tok for tok, _ in steps]
+            payload = json.dumps(
+                {"answer": " ".join(toks).strip(), "eps_spent": float(engine.acc.spent), "slo": engine.slo}
+            )
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload.encode("utf-8"))))
+            self.end_headers()
+            self.wfile.write(payload.encode("utf-8"))
+
+    return Handler
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """
+    Serve the pipeline over HTTP with a warm index.
+
+    POST /generate with {"query": ..., "stream": false} returns
+    {"answer": ..., "eps_spent": ..., "slo": ...}; with "stream": true the
+    response is NDJSON, one {"token": ..., "eps_spent": ...} object per
+    released token. An optional "deadline" (seconds) bounds decoding time.
+    Every request gets a fresh engine, and so a fresh privacy budget.
+    Malformed requests get a 400.
+    """
+    from http.server import ThreadingHTTPServer
+    from pathlib import Path
+
+    from ragenetics.pipeline.builder import build_executor, load_store_for
+
+    cfg = _load_config(args.config)
+    store = load_store_for(cfg, Path(args.index))
+    # One executor (thread pool + latency history) shared by all requests
+    executor = build_executor(cfg)
+
+    server = ThreadingHTTPServer((args.host, args.port), serve_handler(cfg, store, executor))
+    print(f"Serving on http://{args.host}:{args.port}/generate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def cmd_load(args: argparse.Namespace) -> int:
+    """
+    Drive the pipeline with open-loop Poisson load and report latency over time.
+    """
+    import json
+    from pathlib import Path
+
+    from ragenetics.pipeline.eval import load_questions
+    from ragenetics.pipeline.loadgen import http_handler, run_load, summarize_load
+
+    if not (args.url or args.config):
+        print("Pass --config (in-process) or --url (running server)")
+        return 2
+
+    path = Path(args.queries)
+    queries = [q["query"] for q in load_questions(path)] if path.exists() else []
+    if not queries:
+        print(f"No queries in {path}; run `ragenetics run` first or pass --queries")
+        return 1
+
+    if args.url:
+        handler = http_handler(args.url)
+    else:
+        from ragenetics.llm.local_openai import build_llm
+        from ragenetics.pipeline.builder import DEFAULT_LLM, build_executor, load_store_for
+        from ragenetics.pipeline.loadgen import DelayedLLM, engine_handler
+
+        cfg = _load_config(args.config)
+        llm = build_llm(cfg.get("llm") or DEFAULT_LLM)
+        if args.llm_latency > 0:
+            llm = DelayedLLM(llm, args.llm_latency, seed=args.seed)
+        handler = engine_handler(cfg, load_store_for(cfg, Path(args.index)), llm, build_executor(cfg))
+
+    results = []
+    for rate in [float(r) for r in args.rate.split(",") if r]:
+        records, depth = run_load(handler, queries, rate, args.duration, workers=args.workers, seed=args.seed)
+        overall, windows = summarize_load(records, depth, args.duration, window=args.window)
+        overall["rate"] = rate
+        results.append({"overall": overall, "windows": windows})
+
+        print(f"\n=== rate {rate:g}/s ===")
+        print(f"{'t_s':>6} {'arrive':>6} {'done':>5} {'rps':>7} {'p50_s':>8} {'p99_s':>8} {'queue':>6} {'eps/s':>7}")
+        for w in windows:
+            p50 = "-" if w["latency_p50_s"] is None else f"{w['latency_p50_s']:.3f}"
+            p99 = "-" if w["latency_p99_s"] is None else f"{w['latency_p99_s']:.3f}"
+            print(
+                f"{w['t_s']:6.1f} {w['arrivals']:6d} {w['completed']:5d} {w['throughput_rps']:7.2f} "
+                f"{p50:>8} {p99:>8} {w['max_queue']:6d} {w['eps_per_s']:7.2f}"
+            )
+
+    print("\n=== summary ===")
+    print(f"{'rate':>6} {'rps':>7} {'p50_s':>8} {'p95_s':>8} {'p99_s':>8} {'queue':>6} {'eps/s':>7} {'errors':>6}")
+    for r in results:
+        o = r["overall"]
+        lat = [("-" if o[k] is None else f"{o[k]:.3f}") for k in ("latency_p50_s", "latency_p95_s", "latency_p99_s")]
+        print(
+            f"{o['rate']:6g} {o['throughput_rps']:7.2f} {lat[0]:>8} {lat[1]:>8} {lat[2]:>8} "
+            f"{o['max_queue']:6d} {o['eps_per_s']:7.2f} {o['errors']:6d}"
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="ragenetics", description="Privacy-preserving RAG over genetic test reports.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="Answer one query under DP")
+    p.add_argument("--config", required=True, help="Path to YAML configuration file")
+    p.add_argument("--query", required=True, help="Query string to run")
+    p.add_argument("--index", default=DEFAULT_INDEX, help="Path to BM25 index JSON")
+    p.add_argument("--log", default="runs/last_run.jsonl", help="Path to JSONL log file")
+    p.add_argument("--stream", action="store_true", help="Print tokens as they are released")
+    p.add_argument("--deadline", type=float, default=None, help="Time budget in seconds (degrades, then stops)")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("build", help="Build a BM25 index from text/markdown files")
+    p.add_argument("--data", required=True, help="Directory of .txt/.md files or .jsonl(.gz) shards")
+    p.add_argument("--out", required=True, help="Output directory where index will be saved")
+    p.add_argument("--stem", action="store_true", help="Light stemming of plain words")
+    p.add_argument("--stopwords", action="store_true", help="Drop common English stop words")
+    p.add_argument("--dense", action="store_true", help="Also build the dense ANN index for hybrid retrieval")
+    p.add_argument("--dense-dim", type=int, default=128, help="Dense embedding dimension")
+    p.add_argument("--dense-dtype", choices=["float16", "int8"], default="float16", help="Dense vector storage type")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("eval", help="Evaluate configs over a question set in parallel")
+    p.add_argument("--questions", required=True, help="JSONL ({'query': ...}) or text file, one question per line")
+    p.add_argument("--config", action="append", required=True, help="YAML config (repeatable)")
+    p.add_argument("--sweep", action="append", default=[], help="Parameter sweep, e.g. privacy.epsilon_per_vote=0.25,0.5")
+    p.add_argument("--index", default=DEFAULT_INDEX, help="Path to BM25 index JSON")
+    p.add_argument("--workers", type=int, default=4, help="Worker processes (0 = in-process)")
+    p.add_argument("--out", default="runs/eval.parquet", help="Results file (.parquet, .feather or .csv)")
+    p.set_defaults(func=cmd_eval)
+
+    p = sub.add_parser("serve", help="Serve the pipeline over HTTP")
+    p.add_argument("--config", required=True, help="Path to YAML configuration file")
+    p.add_argument("--index", default=DEFAULT_INDEX, help="Path to BM25 index JSON")
+    p.add_argument("--host", default="127.0.0.1", help="Bind address")
+    p.add_argument("--port", type=int, default=8000, help="Bind port")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("load", help="Open-loop load test (Poisson arrivals) against the pipeline")
+    p.add_argument("--config", help="YAML config for in-process runs")
+    p.add_argument("--queries", default="runs/last_run.jsonl", help="Run log or question file to replay")
+    p.add_argument("--index", default=DEFAULT_INDEX, help="Path to BM25 index JSON")
+    p.add_argument("--url", help="POST to a `ragenetics serve` endpoint instead of running in-process")
+    p.add_argument("--rate", default="2", help="Arrivals per second; comma-separated values sweep")
+    p.add_argument("--duration", type=float, default=10.0, help="Arrival window per rate, seconds")
+    p.add_argument("--workers", type=int, default=8, help="Requests served concurrently")
+    p.add_argument("--window", type=float, default=1.0, help="Report window, seconds")
+    p.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call (in-process)")
+    p.add_argument("--seed", type=int, default=0, help="Arrival schedule seed")
+    p.add_argument("--out", help="Write overall and per-window metrics as JSON")
+    p.set_defaults(func=cmd_load)
+
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
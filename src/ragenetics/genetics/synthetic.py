@@ -0,0 +1,271 @@
+"""
+Synthetic genetic test reports for scale testing.
+
+Reports are built from a Zipfian narrative vocabulary, a variable number of
+HPO phenotypes, and HGVS variants with matching coding and protein changes,
+so index size, term statistics and entity density resemble real reports
+more than a fixed template does. Output is sharded JSONL (optionally
+gzipped) that `read_and_chunk_dir` and `ragenetics build` read directly.
+"""
+import gzip
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+HPO = [
+    ("HP:0001250", "Seizures"),
+    ("HP:0001263", "Global developmental delay"),
+    ("HP:0004322", "Short stature"),
+    ("HP:0001249", "Intellectual disability"),
+    ("HP:0001252", "Hypotonia"),
+    ("HP:0000252", "Microcephaly"),
+    ("HP:0002719", "Recurrent infections"),
+    ("HP:0001508", "Failure to thrive"),
+    ("HP:0000717", "Autism"),
+    ("HP:0000407", "Sensorineural hearing impairment"),
+    ("HP:0002027", "Diarrhea"),
+    ("HP:0001631", "Atrial septal defect"),
+    ("HP:0001629", "Ventricular septal defect"),
+    ("HP:0000486", "Strabismus"),
+    ("HP:0001166", "Arachnodactyly"),
+    ("HP:0001083", "Ectopia lentis"),
+    ("HP:0002616", "Aortic root aneurysm"),
+    ("HP:0002659", "Increased susceptibility to fractures"),
+    ("HP:0000592", "Blue sclerae"),
+    ("HP:0000113", "Polycystic kidney dysplasia"),
+    ("HP:0003002", "Breast carcinoma"),
+    ("HP:0100615", "Ovarian neoplasm"),
+    ("HP:0002110", "Bronchiectasis"),
+    ("HP:0001738", "Exocrine pancreatic insufficiency"),
+    ("HP:0001537", "Abnormality of hair morphology"),
+]
+
+# (gene, coding sequence length in nucleotides); more frequently tested genes first
+GENES = [
+    ("CFTR", 4443), ("BRCA1", 5592), ("BRCA2", 10257), ("FBN1", 8616), ("PAH", 1359),
+    ("PKD1", 12912), ("COL1A1", 4395), ("GJB2", 681), ("SCN1A", 6030), ("MECP2", 1461),
+    ("TP53", 1182), ("MLH1", 2271), ("MSH2", 2805), ("LDLR", 2583), ("MYH7", 5808),
+    ("KCNQ1", 2031), ("DMD", 11058), ("NF1", 8520), ("TSC2", 5424), ("PTEN", 1212),
+    ("ATM", 9171), ("PALB2", 3561), ("CHEK2", 1632), ("COL1A2", 4101), ("RYR1", 15117),
+]
+
+AMINO_ACIDS = [
+    "Ala", "Arg", "Asn", "Asp", "Cys", "Gln", "Glu", "Gly", "His", "Ile",
+    "Leu", "Lys", "Met", "Phe", "Pro", "Ser", "Thr", "Trp", "Tyr", "Val",
+]
+BASES = "ACGT"
+
+CLASSIFICATIONS = ["Pathogenic", "Likely pathogenic", "Variant of uncertain significance", "Likely benign"]
+ZYGOSITY = ["heterozygous", "homozygous", "hemizygous", "compound heterozygous"]
+
+# Frequent narrative words; the tail of the vocabulary is padded with synthetic terms
+NARRATIVE = """
+the of and in with was is a to for patient variant this reported findings clinical
+testing family history phenotype consistent gene not been has proband sequencing analysis
+evaluation recommended genetic counseling individuals observed previously segregation
+population frequency databases literature functional studies evidence criteria acmg amp
+classification affected unaffected relatives maternal paternal inherited de novo onset
+age symptoms presentation referral indication result interpretation confirmed coverage
+exon intron splice region deletion duplication missense nonsense frameshift truncating
+protein transcript allele carrier screening cascade surveillance management follow up
+""".split()
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    syll = ["ar", "be", "cy", "do", "el", "fo", "gi", "ha", "io", "ju", "ka", "lo", "mu", "ne", "or", "pa", "qui", "ri"]
+    return "".join(rng.choice(syll) for _ in range(rng.randint(2, 4)))
+
+
+def _zipf_cum(n: int, s: float = 1.0) -> List[float]:
+    """
+    Cumulative Zipf weights 1/r^s for ranks 1..n, for random.choices(cum_weights=...).
+    """
+    return list(accumulate(1.0 / (r + 1) ** s for r in range(n)))
+
+
+def build_vocabulary(size: int, zipf: float, seed: int = 0) -> Tuple[List[str], List[float]]:
+    """
+    Narrative vocabulary with Zipfian cumulative weights.
+
+    Returns:
+        (words, cumulative weights) for random.choices(cum_weights=...).
+    """
+    rng = random.Random(f"vocab:{seed}")
+    words = list(dict.fromkeys(NARRATIVE))
+    seen = set(words)
+    while len(words) < size:
+        w = _pseudo_word(rng)
+        if w not in seen:
+            seen.add(w)
+            words.append(w)
+    return words, _zipf_cum(len(words), zipf)
+
+
+def make_variant(rng: random.Random, cds_len: int) -> str:
+    """
+    A coding HGVS change with a consistent protein consequence, e.g.
+    "c.1582G>A (p.Gly528Ser)" or "c.1521_1523del (p.Phe508del)".
+    """
+    pos = rng.randint(1, cds_len)
+    codon = (pos + 2) // 3
+    ref_aa = rng.choice(AMINO_ACIDS)
+    kind = rng.random()
+    if kind < 0.55:
+        ref = rng.choice(BASES)
+        alt = rng.choice(BASES.replace(ref, ""))
+        if rng.random() < 0.12:
+            # Intronic splice-region change: no protein annotation
+            return f"c.{pos}{'+' if rng.random() < 0.5 else '-'}{rng.randint(1, 20)}{ref}>{alt}"
+        if rng.random() < 0.15:
+            return f"c.{pos}{ref}>{alt} (p.{ref_aa}{codon}Ter)"
+        alt_aa = rng.choice([a for a in AMINO_ACIDS if a != ref_aa])
+        return f"c.{pos}{ref}>{alt} (p.{ref_aa}{codon}{alt_aa})"
+    if kind < 0.8:
+        size = rng.choice([1, 1, 1, 2, 3, 4, 5])
+        if size % 3 == 0:
+            return f"c.{pos}_{pos + size - 1}del (p.{ref_aa}{codon}del)"
+        span = f"c.{pos}del" if size == 1 else f"c.{pos}_{pos + size - 1}del"
+        return f"{span} (p.{ref_aa}{codon}fs)"
+    if kind < 0.92:
+        return f"c.{pos}dup (p.{ref_aa}{codon}fs)"
+    ins = "".join(rng.choice(BASES) for _ in range(rng.randint(1, 4)))
+    return f"c.{pos}_{pos + 1}ins{ins} (p.{ref_aa}{codon}fs)"
+
+
+class ReportGenerator:
+    """
+    Deterministic report source for one shard.
+    """
+
+    def __init__(self, seed: int, shard: int, vocab_size: int = 20000, zipf: float = 1.1, dup_rate: float = 0.0):
+        """
+        Args:
+            seed (int): Corpus seed; combined with `shard` for this shard's stream.
+            shard (int): Shard number.
+            vocab_size (int): Narrative vocabulary size.
+            zipf (float): Zipf exponent for narrative words.
+            dup_rate (float): Probability that a report is a near-duplicate of
+                a recent report in the same shard.
+        """
+        self.rng = random.Random(f"{seed}:{shard}")
+        self.shard = shard
+        self.dup_rate = float(dup_rate)
+        self.words, self.word_cum = build_vocabulary(vocab_size, zipf, seed)
+        self.hpo_cum = _zipf_cum(len(HPO), 0.8)
+        self.gene_cum = _zipf_cum(len(GENES), 1.0)
+        self.recent: List[Dict[str, Any]] = []
+
+    def _sentence(self, n: int) -> str:
+        words = self.rng.choices(self.words, cum_weights=self.word_cum, k=n)
+        return " ".join(words).capitalize() + "."
+
+    def _narrative(self) -> str:
+        # Report body length is roughly lognormal, median ~110 words
+        n = max(12, int(self.rng.lognormvariate(4.7, 0.5)))
+        out = []
+        while n > 0:
+            k = min(n, self.rng.randint(8, 22))
+            out.append(self._sentence(k))
+            n -= k
+        return " ".join(out)
+
+    def _near_duplicate(self, src: Dict[str, Any], rid: str) -> Dict[str, Any]:
+        words = src["text"].split(" ")
+        for _ in range(self.rng.randint(1, 3)):
+            j = self.rng.randrange(len(words))
+            words[j] = self.rng.choices(self.words, cum_weights=self.word_cum, k=1)[0]
+        return {**src, "id": rid, "text": " ".join(words), "near_duplicate_of": src["id"]}
+
+    def report(self, i: int) -> Dict[str, Any]:
+        rid = f"s{self.shard:05d}-{i:07d}"
+        rng = self.rng
+        if self.recent and rng.random() < self.dup_rate:
+            return self._near_duplicate(rng.choice(self.recent), rid)
+
+        n_pheno = min(len(HPO), 1 + int(rng.expovariate(0.6)))
+        phenos = list({h: None for h in rng.choices(HPO, cum_weights=self.hpo_cum, k=n_pheno)})
+        gene, cds_len = rng.choices(GENES, cum_weights=self.gene_cum, k=1)[0]
+        variants = [make_variant(rng, cds_len) for _ in range(1 if rng.random() < 0.8 else 2)]
+        label = ", ".join(f"{name.lower()} ({hid})" if rng.random() < 0.4 else name.lower() for hid, name in phenos)
+
+        text = (
+            f"Indication: {label}. "
+            f"Result: {rng.choice(CLASSIFICATIONS)} {rng.choice(ZYGOSITY)} variant(s) in {gene}: "
+            f"{'; '.join(variants)}. "
+            f"Interpretation: {self._narrative()} "
+            "Recommendation: correlate with phenotype and ACMG/AMP criteria; genetic counseling advised."
+        )
+        rec = {
+            "id": rid,
+            "text": text,
+            "gene": gene,
+            "hgvs": [v.split(" ")[0] for v in variants],
+            "hpo": [hid for hid, _ in phenos],
+        }
+        self.recent.append(rec)
+        if len(self.recent) > 64:
+            self.recent.pop(0)
+        return rec
+
+
+def write_shard(
+    out_dir: str,
+    shard: int,
+    n: int,
+    seed: int = 0,
+    vocab_size: int = 20000,
+    zipf: float = 1.1,
+    dup_rate: float = 0.0,
+    compress: bool = True,
+) -> Tuple[str, int]:
+    """
+    Write one shard of `n` reports as JSONL (gzipped if `compress`).
+
+    Returns:
+        (path, reports written)
+    """
+    gen = ReportGenerator(seed, shard, vocab_size=vocab_size, zipf=zipf, dup_rate=dup_rate)
+    path = Path(out_dir) / f"reports-{shard:05d}.jsonl{'.gz' if compress else ''}"
+    tmp = path.with_name(path.name + ".tmp")
+    # Fast gzip level: the corpus is regenerated, not archived
+    f = gzip.open(tmp, "wt", encoding="utf-8", compresslevel=3) if compress else open(tmp, "w", encoding="utf-8")
+    with f:
+        f.writelines(json.dumps(gen.report(i)) + "\n" for i in range(n))
+    os.replace(tmp, path)
+    return str(path), n
+
+
+def generate_corpus(
+    out_dir: Path,
+    n_reports: int,
+    shard_size: int = 50000,
+    workers: Optional[int] = None,
+    **kwargs: Any,
+) -> List[Tuple[str, int]]:
+    """
+    Generate `n_reports` reports across a process pool, one shard per task.
+
+    Each shard draws from its own seeded stream, so output is identical for
+    any number of workers.
+
+    Args:
+        out_dir (Path): Output directory.
+        n_reports (int): Total reports.
+        shard_size (int): Reports per shard file.
+        workers (int | None): Processes; None = CPU count, 0 = in-process.
+        **kwargs: Passed to `write_shard` (seed, vocab_size, zipf, dup_rate, compress).
+
+    Returns:
+        List[(path, count)] in shard order.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    sizes = [min(shard_size, n_reports - s) for s in range(0, n_reports, shard_size)]
+    if workers == 0:
+        return [write_shard(str(out_dir), i, n, **kwargs) for i, n in enumerate(sizes)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_shard, str(out_dir), i, n, **kwargs) for i, n in enumerate(sizes)]
+        return [f.result() for f in futures]
@@ -1,6 +1,20 @@
-from typing import List
+from functools import partial
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
 from ragenetics.retrieval.rankers import heuristic_boost
 
+# LLM methods that correspond to one provider round trip each (used by the
+# call-counting and latency-injecting proxies)
+CALL_METHODS = frozenset(
+    {
+        "sample_next_token",
+        "sample_next_tokens",
+        "sample_next_span",
+        "sample_next_spans",
+        "yesno",
+        "yesno_many",
+    }
+)
+
 
 class VoterLLM:
     """
@@ -8,16 +22,40 @@ class VoterLLM:
     next tokens and vote on candidate completions.
     """
 
-    def __init__(self, retriever, model):
+    def __init__(self, retriever, model, k: int = 6):
         """
         Initialize the VoterLLM.
 
         Args:
             retriever: Object that supports similarity_search(question, k).
             model: Object that supports sample_next_token() and yesno().
+            k: Number of passages to retrieve per question.
         """
         self.retriever = retriever
         self.model = model
+        self.k = int(k)
+
+    @property
+    def share_key(self) -> Hashable:
+        """
+        Voters with equal keys retrieve the same context and sample from the
+        same model, so their deterministic stages can be computed once.
+        """
+        return (id(self.retriever), id(self.model), self.k)
+
+    def context(self, question: str, boost: bool = True) -> List[str]:
+        """
+        Retrieve (and optionally re-rank) context passages for a question.
+
+        Args:
+            question (str): User question or query.
+            boost (bool): Apply heuristic HPO/gene re-ranking.
+
+        Returns:
+            List[str]: Context passages.
+        """
+        ctx = self.retriever.similarity_search(question, k=self.k)
+        return heuristic_boost(question, ctx) if boost else ctx
 
     def propose_next(self, question: str, prefix: str = "") -> str:
         """
@@ -30,9 +68,24 @@ class VoterLLM:
         Returns:
             str: Proposed next token or text.
         """
-        ctx = self.retriever.similarity_search(question, k=6)
-        ctx = heuristic_boost(question, ctx)
-        return self.model.sample_next_token(question, prefix, ctx)
+        return self.model.sample_next_token(question, prefix, self.context(question))
+
+    def propose_span(self, question: str, prefix: str, n_words: int) -> str:
+        """
+        Propose the next `n_words` words, or a single token if the model
+        cannot produce spans.
+
+        Args:
+            question (str): User question or query.
+            prefix (str): Existing partial completion.
+            n_words (int): Span length in words.
+
+        Returns:
+            str: Proposed continuation.
+        """
+        if not hasattr(self.model, "sample_next_span"):
+            return self.propose_next(question, prefix)
+        return self.model.sample_next_span(question, prefix, self.context(question), n_words)
 
     def agrees(self, question: str, prefix: str, candidate: str) -> bool:
         """
@@ -46,5 +99,114 @@ class VoterLLM:
         Returns:
             bool: True if model agrees, False otherwise.
         """
-        ctx = self.retriever.similarity_search(question, k=6)
-        return self.model.yesno(question, prefix, candidate, ctx)
+        return self.model.yesno(question, prefix, candidate, self.context(question, boost=False))
+
+
+def _group_voters(voters: Sequence) -> Dict[Hashable, List[int]]:
+    """
+    Group voter indices by share_key. Voters without one get their own group.
+    """
+    groups: Dict[Hashable, List[int]] = {}
+    for i, v in enumerate(voters):
+        key: Optional[Hashable] = getattr(v, "share_key", None)
+        groups.setdefault(("solo", i) if key is None else key, []).append(i)
+    return groups
+
+
+def _one(fn: Callable, *args, **kwargs) -> list:
+    return [fn(*args, **kwargs)]
+
+
+def _run_tasks(tasks: List[Tuple[List[int], Callable[[], list]]], n: int, default, executor=None) -> list:
+    """
+    Run (voter indices, call) tasks, serially or on an executor, and scatter
+    each call's results back to voter order.
+    """
+    fns = [fn for _, fn in tasks]
+    results = executor.run(fns) if executor is not None else [fn() for fn in fns]
+    out = [default] * n
+    for (idxs, _), res in zip(tasks, results):
+        for i, r in zip(idxs, res):
+            out[i] = r
+    return out
+
+
+def propose_all(voters: Sequence, question: str, prefix: str = "", span: int = 1, executor=None) -> List[str]:
+    """
+    Collect one proposal per voter, computing shared stages once per group.
+
+    Voters that share a retriever and model reuse one retrieval + re-rank and
+    draw all their samples in a single `sample_next_tokens(..., n)` call when
+    the model supports it. Other voters fall back to `propose_next`.
+
+    Args:
+        voters: Voter objects with `propose_next(question, prefix)`.
+        question (str): User question or query.
+        prefix (str): Existing partial completion.
+        span (int): Words per proposal; >1 uses `propose_span` /
+            `sample_next_span(s)` where available.
+        executor: Optional HedgedExecutor; model calls then run concurrently.
+
+    Returns:
+        List[str]: Proposals in voter order.
+    """
+    tasks: List[Tuple[List[int], Callable[[], list]]] = []
+    for idxs in _group_voters(voters).values():
+        lead = voters[idxs[0]]
+        if len(idxs) == 1 or not hasattr(lead, "context"):
+            for i in idxs:
+                v = voters[i]
+                if span > 1 and hasattr(v, "propose_span"):
+                    tasks.append(([i], partial(_one, v.propose_span, question, prefix, span)))
+                else:
+                    tasks.append(([i], partial(_one, v.propose_next, question, prefix=prefix)))
+            continue
+
+        model = lead.model
+        ctx = lead.context(question)
+        if span > 1 and hasattr(model, "sample_next_spans"):
+            tasks.append((idxs, partial(model.sample_next_spans, question, prefix, ctx, span, n=len(idxs))))
+        elif span > 1 and hasattr(model, "sample_next_span"):
+            for i in idxs:
+                tasks.append(([i], partial(_one, model.sample_next_span, question, prefix, ctx, span)))
+        elif hasattr(model, "sample_next_tokens"):
+            tasks.append((idxs, partial(model.sample_next_tokens, question, prefix, ctx, n=len(idxs))))
+        else:
+            for i in idxs:
+                tasks.append(([i], partial(_one, model.sample_next_token, question, prefix, ctx)))
+    return _run_tasks(tasks, len(voters), "", executor)
+
+
+def agree_all(voters: Sequence, question: str, prefix: str, candidate: str, executor=None) -> List[bool]:
+    """
+    Collect one agreement vote per voter, computing shared stages once per group.
+
+    Same grouping as `propose_all`; models may expose `yesno_many(..., n)`
+    to answer for a whole group in one call.
+
+    Args:
+        voters: Voter objects with `agrees(question, prefix, candidate)`.
+        question (str): User question or query.
+        prefix (str): Partial answer so far.
+        candidate (str): Candidate next token.
+        executor: Optional HedgedExecutor; model calls then run concurrently.
+
+    Returns:
+        List[bool]: Votes in voter order.
+    """
+    tasks: List[Tuple[List[int], Callable[[], list]]] = []
+    for idxs in _group_voters(voters).values():
+        lead = voters[idxs[0]]
+        if len(idxs) == 1 or not hasattr(lead, "context"):
+            for i in idxs:
+                tasks.append(([i], partial(_one, voters[i].agrees, question, prefix=prefix, candidate=candidate)))
+            continue
+
+        model = lead.model
+        ctx = lead.context(question, boost=False)
+        if hasattr(model, "yesno_many"):
+            tasks.append((idxs, partial(model.yesno_many, question, prefix, candidate, ctx, n=len(idxs))))
+        else:
+            for i in idxs:
+                tasks.append(([i], partial(_one, model.yesno, question, prefix, candidate, ctx)))
+    return [bool(v) for v in _run_tasks(tasks, len(voters), False, executor)]
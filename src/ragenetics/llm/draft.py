@@ -0,0 +1,87 @@
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Candidates kept per n-gram context; extras are only needed to avoid repeats
+TOP_CANDIDATES = 3
+
+
+def _ngram_table(texts: Iterable[str], n: int) -> Dict[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Map every context of 0..n-1 preceding words to its most frequent next words.
+    """
+    counts: Dict[Tuple[str, ...], Counter] = {}
+    for text in texts:
+        words = text.lower().split()
+        for i, w in enumerate(words):
+            for order in range(0, n):
+                if order > i:
+                    break
+                counts.setdefault(tuple(words[i - order:i]), Counter())[w] += 1
+    return {ctx: tuple(w for w, _ in c.most_common(TOP_CANDIDATES)) for ctx, c in counts.items()}
+
+
+class NGramDraftLLM:
+    """
+    Local n-gram draft model used as the baseline proposer in DPSparseVoteRAG.
+
+    Proposes the next word from the longest matching n-gram context in a
+    compact model over a corpus of public text. No network round trip is
+    involved.
+
+    Privacy note: an accepted baseline token is released without noise, so
+    the model is built only from public text and never conditions on
+    retrieved passages. Retrieved `ctx` is accepted for interface
+    compatibility with the LLMs and ignored.
+    """
+
+    def __init__(self, texts: Sequence[str], n: int = 3):
+        """
+        Args:
+            texts: Public corpus the n-gram model is built from.
+            n (int): N-gram order (contexts of up to n-1 words).
+        """
+        self.n = max(1, int(n))
+        self.corpus = _ngram_table(texts, self.n)
+
+    @classmethod
+    def from_dir(cls, root: Path, n: int = 3) -> "NGramDraftLLM":
+        """
+        Build from a directory of public text (.txt/.md/.jsonl(.gz) files).
+        """
+        from ragenetics.retrieval.chunking import read_and_chunk_dir
+
+        root = Path(root)
+        if not root.is_dir():
+            raise FileNotFoundError(f"Draft corpus not found: {root}")
+        return cls([d["text"] for d in read_and_chunk_dir(root, chunk_size=100000, overlap=0)], n=n)
+
+    def sample_next_token(self, question: str, prefix: str, ctx: List[str]) -> str:
+        """
+        Propose the next word for `prefix` (deterministic, longest match first).
+
+        Words among the last n-1 emitted are skipped to avoid loops; `ctx`
+        is ignored (see the class privacy note).
+        """
+        history = prefix.lower().split()
+        recent = set(history[-(self.n - 1):]) if self.n > 1 else set()
+
+        for order in range(min(self.n - 1, len(history)), -1, -1):
+            key = tuple(history[len(history) - order:])
+            for cand in self.corpus.get(key, ()):
+                if cand not in recent:
+                    return cand
+        return self._fallback(question, recent)
+
+    @staticmethod
+    def _fallback(question: str, recent: set) -> str:
+        for w in question.lower().split():
+            if w not in recent:
+                return w
+        return ""
+
+    def yesno(self, question: str, prefix: str, candidate: str, ctx: List[str]) -> bool:
+        """
+        Agree when the candidate is what this model would propose.
+        """
+        return candidate.strip().lower() == self.sample_next_token(question, prefix, ctx)
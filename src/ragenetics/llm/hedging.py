@@ -0,0 +1,189 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class HedgedExecutor:
+    """
+    Runs one decoding step's voter calls concurrently, hedging stragglers.
+
+    Each call that is still running `hedge_quantile` of recent call latency
+    after the step started is re-issued once; whichever attempt returns first
+    is used and the other is cancelled (a queued attempt never starts; a
+    running one is abandoned and its result dropped).
+
+    Threads cannot be interrupted, so an abandoned attempt keeps its pool slot
+    until it returns. Hedges are therefore capped by `in_flight`, the attempts
+    submitted and not yet finished across every step sharing the executor
+    (concurrent requests, abandoned losers): a step only issues as many hedges
+    as there are free pool slots, reserved under the lock, so hedges never
+    queue behind other work and abandoned attempts cannot pile up beyond the
+    pool size. Ordinary calls are always submitted and may queue.
+
+    Both attempts send the identical request, so either result is a valid
+    draw of that voter's output: hedging changes latency, not what a voter
+    can report, and privacy accounting is unaffected.
+
+    `stats` counts steps, calls, hedges issued and hedges won (hedge finished
+    first); `step_latency()` reports step latency percentiles.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        hedge_quantile: float = 0.95,
+        min_history: int = 20,
+        history: int = 512,
+        pool: Optional[ThreadPoolExecutor] = None,
+    ):
+        """
+        Args:
+            max_workers (int): Thread pool size; with a shared `pool`, pass
+                that pool's size.
+            hedge_quantile (float): Latency quantile after which a call is hedged.
+            min_history (int): Calls observed before hedging starts.
+            history (int): Recent call latencies kept for the quantile.
+            pool (ThreadPoolExecutor | None): Shared pool to submit to.
+        """
+        self.pool = pool or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="voter")
+        self.max_workers = int(max_workers)
+        self.hedge_quantile = float(hedge_quantile)
+        self.min_history = int(min_history)
+        self._latencies: Deque[float] = deque(maxlen=int(history))
+        self._steps: Deque[float] = deque(maxlen=4096)
+        self._lock = threading.Lock()
+        self.stats = {"steps": 0, "calls": 0, "hedges_issued": 0, "hedges_won": 0}
+        # Attempts submitted and not yet finished, across all steps
+        self.in_flight = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Seconds to wait before hedging, or None while history is too short.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_history:
+                return None
+            return float(np.quantile(np.fromiter(self._latencies, dtype=float), self.hedge_quantile))
+
+    def _timed(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        def call():
+            t = time.perf_counter()
+            out = fn()
+            with self._lock:
+                self._latencies.append(time.perf_counter() - t)
+            return out
+
+        return call
+
+    def run(self, calls: Sequence[Callable[[], Any]]) -> List[Any]:
+        """
+        Run all calls concurrently and return their results in order.
+
+        Raises the first error of a call whose attempts all failed.
+        """
+        t0 = time.perf_counter()
+        n = len(calls)
+        delay = self.hedge_delay()
+        attempts: Dict[Future, int] = {}
+        hedges = set()
+        with self._lock:
+            self.in_flight += n
+        for i, fn in enumerate(calls):
+            attempts[self._submit(fn)] = i
+
+        results: List[Any] = [None] * n
+        finished = set()
+        won = 0
+        hedged = delay is None
+        while len(finished) < n:
+            timeout = None if hedged else max(0.0, t0 + delay - time.perf_counter())
+            done, _ = wait(list(attempts), timeout=timeout, return_when=FIRST_COMPLETED)
+            for f in done:
+                i = attempts.pop(f, None)
+                if i is None or i in finished:
+                    # Losing attempt, already cancelled above
+                    continue
+                if f.exception() is not None:
+                    # Another attempt for this call may still succeed
+                    if any(j == i for j in attempts.values()):
+                        continue
+                    self._cancel_all(attempts)
+                    raise f.exception()
+                results[i] = f.result()
+                finished.add(i)
+                if f in hedges:
+                    won += 1
+                # Cancel the losing attempt for this call
+                for g in [g for g, j in attempts.items() if j == i]:
+                    del attempts[g]
+                    self._cancel(g)
+
+            if not hedged and time.perf_counter() >= t0 + delay:
+                hedged = True
+                pending = [i for i in range(n) if i not in finished]
+                with self._lock:
+                    # Reserve free slots now so concurrent steps cannot take them too
+                    budget = min(len(pending), max(0, self.max_workers - self.in_flight))
+                    self.in_flight += budget
+                for i in pending[:budget]:
+                    f = self._submit(calls[i])
+                    attempts[f] = i
+                    hedges.add(f)
+
+        with self._lock:
+            self.stats["steps"] += 1
+            self.stats["calls"] += n
+            self.stats["hedges_issued"] += len(hedges)
+            self.stats["hedges_won"] += won
+            self._steps.append(time.perf_counter() - t0)
+        return results
+
+    def _submit(self, fn: Callable[[], Any]) -> Future:
+        """
+        Submit an attempt already counted in `in_flight`; it is uncounted
+        when it finishes or is cancelled.
+        """
+        f = self.pool.submit(self._timed(fn))
+        f.add_done_callback(self._release)
+        return f
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _cancel(f: Future) -> None:
+        """
+        Cancel an attempt; a running one is abandoned and stays in
+        `in_flight` until it returns.
+        """
+        f.cancel()
+
+    def _cancel_all(self, attempts: Dict[Future, int]) -> None:
+        for f in attempts:
+            self._cancel(f)
+        attempts.clear()
+
+    def step_latency(self) -> Dict[str, float]:
+        """
+        Step latency percentiles (seconds) over recent steps.
+        """
+        with self._lock:
+            steps = np.asarray(self._steps)
+        if not len(steps):
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        p50, p95, p99 = np.quantile(steps, [0.5, 0.95, 0.99])
+        return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Hedge counters plus step latency percentiles.
+        """
+        with self._lock:
+            out: Dict[str, float] = dict(self.stats)
+        out.update({f"step_{k}_s": v for k, v in self.step_latency().items()})
+        return out
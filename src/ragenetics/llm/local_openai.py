@@ -1,15 +1,24 @@
 import os
 import random
+import threading
 from typing import List, Optional
 
+from ragenetics.llm.prompts import estimate_tokens, next_token_prompt, span_prompt, yesno_prompt
+
 
 class MockLLM:
     """
     Tiny mock LLM for testing. Samples a 'next token' from the question/context bag.
+
+    `input_tokens` estimates the prompt tokens a provider would have been
+    sent (same templates as OpenAILLM), so prompt size can be measured offline.
     """
 
-    def __init__(self, seed: int = 7):
+    def __init__(self, seed: int = 7, max_context_tokens: Optional[int] = None):
         random.seed(seed)
+        self.max_context_tokens = max_context_tokens
+        self.input_tokens = 0
+        self._lock = threading.Lock()
         self.vocab = [
             ",",
             ".",
@@ -28,6 +37,10 @@ class MockLLM:
         """
         Extremely simple heuristic: prefer words from question/context; else fallback vocab.
         """
+        self._count(next_token_prompt(question, prefix, ctx, self.max_context_tokens))
+        return self._pick(question, ctx)
+
+    def _pick(self, question: str, ctx: List[str]) -> str:
         bag: List[str] = []
         bag += question.lower().split()
         for c in ctx:
@@ -36,10 +49,22 @@ class MockLLM:
             return random.choice(bag[:50])
         return random.choice(self.vocab)
 
+    def _count(self, prompt: str) -> None:
+        with self._lock:
+            self.input_tokens += estimate_tokens(prompt)
+
+    def sample_next_span(self, question: str, prefix: str, ctx: List[str], n_words: int) -> str:
+        """
+        Sample `n_words` tokens independently and join them.
+        """
+        self._count(span_prompt(question, prefix, n_words, ctx, self.max_context_tokens))
+        return " ".join(self._pick(question, ctx) for _ in range(n_words))
+
     def yesno(self, question: str, prefix: str, candidate: str, ctx: List[str]) -> bool:
         """
         'Agree' when the candidate token appears in any context or prefix (case-insensitive).
         """
+        self._count(yesno_prompt(question, prefix, candidate, ctx, self.max_context_tokens))
         text = " ".join(ctx).lower() + " " + prefix.lower()
         return candidate.strip().lower() in text
 
@@ -52,9 +77,19 @@ class OpenAILLM:
       - OPENAI_API_KEY
       - OPENAI_BASE_URL (optional)
       - OPENAI_MODEL (optional; defaults to 'gpt-4o-mini')
+
+    Prompts put the question and context first so repeated calls for one
+    answer share a cacheable prefix. `calls` and `input_tokens` track the
+    number of requests and the estimated prompt tokens sent.
     """
 
-    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_context_tokens: Optional[int] = None,
+    ):
         from openai import OpenAI
 
         self.client = OpenAI(
@@ -62,44 +97,77 @@ class OpenAILLM:
             base_url=base_url or os.getenv("OPENAI_BASE_URL"),
         )
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.max_context_tokens = max_context_tokens
+        self.calls = 0
+        self.input_tokens = 0
+        # Voter calls may run on HedgedExecutor threads
+        self._lock = threading.Lock()
 
-    def sample_next_token(self, question: str, prefix: str, ctx: List[str]) -> str:
-        """
-        Ask the model to emit just the next token.
-        """
-        prompt = (
-            f"Question: {question}\n"
-            f"Context:\n"
-            f"{'\n'.join(ctx)}\n"
-            f"Given the partial answer: '{prefix}', emit just the next token."
-        )
-        r = self.client.chat.completions.create(
+    def _complete(self, prompt: str, n: int = 1, max_tokens: int = 1):
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += estimate_tokens(prompt)
+        return self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=1,
+            max_tokens=max_tokens,
+            n=n,
         )
-        content = (r.choices[0].message.content or "").strip()
+
+    @staticmethod
+    def _first_token(choice) -> str:
+        content = (choice.message.content or "").strip()
         # Return the first whitespace-separated token if present; else empty string
         return content.split()[0] if content else ""
 
+    @staticmethod
+    def _first_words(choice, n_words: int) -> str:
+        return " ".join((choice.message.content or "").split()[:n_words])
+
+    def sample_next_token(self, question: str, prefix: str, ctx: List[str]) -> str:
+        """
+        Ask the model to emit just the next token.
+        """
+        r = self._complete(next_token_prompt(question, prefix, ctx, self.max_context_tokens))
+        return self._first_token(r.choices[0])
+
+    def sample_next_tokens(self, question: str, prefix: str, ctx: List[str], n: int) -> List[str]:
+        """
+        Draw `n` independent next-token samples from a single completion call.
+        """
+        r = self._complete(next_token_prompt(question, prefix, ctx, self.max_context_tokens), n=n)
+        return [self._first_token(c) for c in r.choices]
+
+    def sample_next_span(self, question: str, prefix: str, ctx: List[str], n_words: int) -> str:
+        """
+        Ask the model for the next `n_words` words.
+        """
+        return self.sample_next_spans(question, prefix, ctx, n_words, n=1)[0]
+
+    def sample_next_spans(self, question: str, prefix: str, ctx: List[str], n_words: int, n: int) -> List[str]:
+        """
+        Draw `n` independent span samples from a single completion call.
+        """
+        prompt = span_prompt(question, prefix, n_words, ctx, self.max_context_tokens)
+        # Words run a little over one token each
+        r = self._complete(prompt, n=n, max_tokens=2 * n_words)
+        return [self._first_words(c, n_words) for c in r.choices]
+
     def yesno(self, question: str, prefix: str, candidate: str, ctx: List[str]) -> bool:
         """
         Ask the model to answer yes/no on whether the next token equals `candidate`.
         """
-        prompt = (
-            f"Question: {question}\n"
-            f"Context:\n"
-            f"{'\n'.join(ctx)}\n"
-            f"Given partial answer '{prefix}', is the next token exactly '{candidate}'? Reply yes or no."
-        )
-        r = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1,
-        )
+        r = self._complete(yesno_prompt(question, prefix, candidate, ctx, self.max_context_tokens))
         reply = (r.choices[0].message.content or "").lower()
         return "yes" in reply
 
+    def yesno_many(self, question: str, prefix: str, candidate: str, ctx: List[str], n: int) -> List[bool]:
+        """
+        Draw `n` independent yes/no answers from a single completion call.
+        """
+        r = self._complete(yesno_prompt(question, prefix, candidate, ctx, self.max_context_tokens), n=n)
+        return ["yes" in (c.message.content or "").lower() for c in r.choices]
+
 
 def build_llm(cfg: dict):
     """
@@ -109,6 +177,7 @@ def build_llm(cfg: dict):
       - model: str (OpenAI model name, optional)
       - base_url: str (optional)
       - api_key: str (optional)
+      - max_context_tokens: int (optional; token budget for retrieved context)
     """
     provider = cfg.get("provider", "mock").lower()
     if provider == "openai":
@@ -116,5 +185,6 @@ def build_llm(cfg: dict):
             model=cfg.get("model"),
             base_url=cfg.get("base_url"),
             api_key=cfg.get("api_key"),
+            max_context_tokens=cfg.get("max_context_tokens"),
         )
-    return MockLLM()
+    return MockLLM(max_context_tokens=cfg.get("max_context_tokens"))
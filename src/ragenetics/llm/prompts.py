@@ -0,0 +1,125 @@
+import math
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+# Templates keep the static part (question + context) first and the part that
+# changes every decoding step (prefix / candidate) last, so consecutive calls
+# for one answer share a long identical prompt prefix.
+CONTEXT_TEMPLATE = "Question: {question}\nContext:\n{context}\n"
+NEXT_TOKEN_TEMPLATE = "Given the partial answer: '{prefix}', emit just the next token."
+SPAN_TEMPLATE = "Given the partial answer: '{prefix}', emit just the next {n_words} words."
+YESNO_TEMPLATE = "Given partial answer '{prefix}', is the next token exactly '{candidate}'? Reply yes or no."
+
+# Words and single punctuation marks; a rough stand-in for BPE pieces
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a string.
+
+    Counts words and punctuation marks, charging long words one token per
+    four characters. Close enough to BPE counts to track prompt size.
+
+    Args:
+        text (str): Input text.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return sum(math.ceil(len(p) / 4) for p in _PIECE_RE.findall(text))
+
+
+def truncate_context(ctx: Sequence[str], max_tokens: Optional[int]) -> List[str]:
+    """
+    Keep passages in order until the token budget is used up.
+
+    The first passage that does not fit is cut at a word boundary; anything
+    after it is dropped.
+
+    Args:
+        ctx (Sequence[str]): Retrieved passages, best first.
+        max_tokens (int | None): Token budget for all passages. None = no limit.
+
+    Returns:
+        List[str]: Passages that fit within the budget.
+    """
+    if max_tokens is None:
+        return list(ctx)
+
+    out: List[str] = []
+    left = int(max_tokens)
+    for passage in ctx:
+        cost = estimate_tokens(passage)
+        if cost <= left:
+            out.append(passage)
+            left -= cost
+            continue
+        words: List[str] = []
+        for w in passage.split():
+            c = estimate_tokens(w)
+            if c > left:
+                break
+            words.append(w)
+            left -= c
+        if words:
+            out.append(" ".join(words))
+        break
+    return out
+
+
+@lru_cache(maxsize=256)
+def _context_block(question: str, ctx: Tuple[str, ...], max_context_tokens: Optional[int]) -> str:
+    context = "\n".join(truncate_context(ctx, max_context_tokens))
+    return CONTEXT_TEMPLATE.format(question=question, context=context)
+
+
+def context_block(question: str, ctx: Sequence[str], max_context_tokens: Optional[int] = None) -> str:
+    """
+    Build (or reuse) the static question + context part of a prompt.
+
+    Args:
+        question (str): User question.
+        ctx (Sequence[str]): Retrieved passages.
+        max_context_tokens (int | None): Token budget for the passages.
+
+    Returns:
+        str: Prompt prefix shared by every call for this question/context.
+    """
+    return _context_block(question, tuple(ctx), max_context_tokens)
+
+
+def next_token_prompt(question: str, prefix: str, ctx: Sequence[str], max_context_tokens: Optional[int] = None) -> str:
+    """
+    Prompt asking for the single next token of a partial answer.
+    """
+    return context_block(question, ctx, max_context_tokens) + NEXT_TOKEN_TEMPLATE.format(prefix=prefix)
+
+
+def span_prompt(
+    question: str,
+    prefix: str,
+    n_words: int,
+    ctx: Sequence[str],
+    max_context_tokens: Optional[int] = None,
+) -> str:
+    """
+    Prompt asking for the next `n_words` words of a partial answer.
+    """
+    return context_block(question, ctx, max_context_tokens) + SPAN_TEMPLATE.format(prefix=prefix, n_words=n_words)
+
+
+def yesno_prompt(
+    question: str,
+    prefix: str,
+    candidate: str,
+    ctx: Sequence[str],
+    max_context_tokens: Optional[int] = None,
+) -> str:
+    """
+    Prompt asking whether `candidate` is the next token of a partial answer.
+    """
+    return context_block(question, ctx, max_context_tokens) + YESNO_TEMPLATE.format(
+        prefix=prefix, candidate=candidate
+    )
@@ -0,0 +1,203 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+from ragenetics.retrieval.vectorstore import LocalBM25Store
+from ragenetics.llm.local_openai import build_llm
+from ragenetics.llm.base import VoterLLM
+from ragenetics.pipeline.dp_rag import DPVoteRAG
+from ragenetics.pipeline.dp_sparse_rag import DPSparseVoteRAG
+from ragenetics.pipeline.scheduler import DeadlineScheduler
+from ragenetics.privacy.sparse_vector import SVTGate
+from ragenetics.utils.io import load_bm25_index
+
+DEFAULT_INDEX = Path("data/embeddings/bm25_index.json")
+DENSE_INDEX_NAME = "dense_index.npz"
+DEFAULT_LLM = {"provider": "mock", "model": "debug-mock", "max_tokens": 256}
+
+
+def load_store(idx_path: Path = DEFAULT_INDEX, hybrid: bool = False, wand: bool = False):
+    """
+    Load a BM25 store from disk, or return an empty store if the index is missing.
+
+    With `hybrid`, the dense index saved next to the BM25 index is loaded too
+    and fused with it (see HybridStore); if it is missing, BM25 alone is used.
+
+    Args:
+        idx_path (Path): Path to the serialized BM25 index.
+        hybrid (bool): Fuse BM25 with the dense index.
+        wand (bool): Rank BM25 with block-max WAND instead of exhaustive scoring.
+
+    Returns:
+        LocalBM25Store | HybridStore: Loaded (possibly empty) store.
+    """
+    idx_path = Path(idx_path)
+    if not idx_path.exists():
+        return LocalBM25Store(wand=wand)
+    store = LocalBM25Store.deserialize(load_bm25_index(idx_path), wand=wand)
+
+    dense_path = idx_path.parent / DENSE_INDEX_NAME
+    if hybrid and dense_path.exists():
+        from ragenetics.retrieval.dense import DenseStore
+        from ragenetics.retrieval.hybrid import HybridStore
+
+        return HybridStore(store, DenseStore.load(dense_path))
+    return store
+
+
+def store_options(cfg: dict) -> Tuple[Tuple[str, bool], ...]:
+    """
+    The `load_store` options a config asks for, as a hashable tuple of
+    (name, value) pairs (`retrieval.hybrid`, `retrieval.wand`).
+    """
+    r = cfg.get("retrieval") or {}
+    return (("hybrid", bool(r.get("hybrid", False))), ("wand", bool(r.get("wand", False))))
+
+
+def load_store_for(cfg: dict, idx_path: Path = DEFAULT_INDEX):
+    """
+    Load the store a config asks for (see `store_options`).
+    """
+    return load_store(idx_path, **dict(store_options(cfg)))
+
+
+def build_scheduler(cfg: dict):
+    """
+    Build a DeadlineScheduler from the optional "deadline" config section.
+
+    Returns:
+        DeadlineScheduler | None: None when no `deadline.seconds` is set.
+    """
+    d = cfg.get("deadline") or {}
+    if d.get("seconds") is None:
+        return None
+    return DeadlineScheduler(
+        d["seconds"],
+        reduced_fraction=d.get("reduced_fraction", 0.5),
+        span_tokens=d.get("span_tokens", 4),
+    )
+
+
+def build_executor(cfg: dict):
+    """
+    Build a HedgedExecutor from the optional "concurrency" config section.
+
+    Returns:
+        HedgedExecutor | None: None unless `concurrency.workers` > 0.
+    """
+    c = cfg.get("concurrency") or {}
+    if not c.get("workers"):
+        return None
+    from ragenetics.llm.hedging import HedgedExecutor
+
+    return HedgedExecutor(
+        max_workers=c["workers"],
+        hedge_quantile=c.get("hedge_quantile", 0.95),
+        min_history=c.get("min_history", 20),
+    )
+
+
+@lru_cache(maxsize=8)
+def load_draft(corpus: str, n: int = 3):
+    """
+    N-gram draft model over a public corpus directory, built once per path.
+
+    Engines are built per request (serve, load tests, eval rows), so the
+    table is cached here rather than rebuilt each time.
+    """
+    from ragenetics.llm.draft import NGramDraftLLM
+
+    return NGramDraftLLM.from_dir(Path(corpus), n=n)
+
+
+def build_draft(cfg: dict):
+    """
+    The sparse engine's baseline proposer from `privacy.svt.draft`, or None
+    to use the LLM.
+
+    Raises:
+        ValueError: If `draft: ngram` is set without `draft_corpus`. Accepted
+            draft tokens are released without noise, so the draft must come
+            from public text, never from the report store.
+    """
+    svt = cfg["privacy"].get("svt") or {}
+    if svt.get("draft") != "ngram":
+        return None
+    corpus = svt.get("draft_corpus")
+    if not corpus:
+        raise ValueError("privacy.svt.draft: ngram requires privacy.svt.draft_corpus (a directory of public text)")
+    return load_draft(str(Path(corpus).resolve()), int(svt.get("draft_order", 3)))
+
+
+def build_engine(cfg: dict, store, llm=None, executor=None, draft=None):
+    """
+    Build a DPVoteRAG or DPSparseVoteRAG engine from a pipeline config.
+
+    Args:
+        cfg (dict): Parsed YAML config with "llm", "retrieval" and "privacy" sections.
+        store: Retriever shared by all voters.
+        llm: Optional prebuilt LLM; built from cfg["llm"] when omitted.
+        executor: Optional HedgedExecutor to share across engines; built from
+            cfg["concurrency"] when omitted.
+        draft: Optional prebuilt baseline proposer for the sparse scheme;
+            built from cfg["privacy"]["svt"] when omitted.
+
+    Returns:
+        DPVoteRAG | DPSparseVoteRAG: Engine with a fresh privacy accountant.
+    """
+    if llm is None:
+        llm = build_llm(cfg.get("llm") or DEFAULT_LLM)
+
+    if executor is None:
+        executor = build_executor(cfg)
+
+    priv = cfg["privacy"]
+    # "all", or a fixed number of voters drawn at random each step
+    quorum = priv.get("quorum", "all")
+    quorum = None if quorum in (None, "all") else int(quorum)
+
+    # Voters share store and model, so the engines retrieve once and batch their samples
+    top_k = (cfg.get("retrieval") or {}).get("top_k", 6)
+    voters = [VoterLLM(store, llm, k=top_k) for _ in range(priv["m_voters"])]
+
+    if priv["scheme"] == "dp_vote":
+        return DPVoteRAG(
+            voters,
+            priv["epsilon_per_vote"],
+            priv["delta"],
+            priv["max_total_epsilon"],
+            wave_size=priv.get("wave_size", 0),
+            epsilon_stop=priv.get("epsilon_stop", 0.0),
+            stop_margin=priv.get("stop_margin", 3.0),
+            scheduler=build_scheduler(cfg),
+            executor=executor,
+            quorum=quorum,
+        )
+
+    # A local n-gram draft over public text proposes tokens without an LLM round trip
+    if draft is None:
+        draft = build_draft(cfg)
+    baseline = draft if draft is not None else llm
+
+    gate = SVTGate(
+        priv["svt"]["threshold"],
+        priv["svt"]["epsilon_gate"],
+        priv["svt"]["epsilon_report"],
+    )
+    return DPSparseVoteRAG(
+        voters,
+        baseline,
+        priv["epsilon_per_vote"],
+        gate,
+        priv["max_total_epsilon"],
+        scheduler=build_scheduler(cfg),
+        executor=executor,
+        quorum=quorum,
+    )
+
+
+def max_tokens_for(cfg: dict, default: int = 256) -> int:
+    """
+    Read the per-answer token limit from a config.
+    """
+    return (cfg.get("llm") or {}).get("max_tokens", default)
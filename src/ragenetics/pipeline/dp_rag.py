@@ -1,8 +1,13 @@
+import random
+import time
 from collections import Counter
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
+from ragenetics.llm.base import propose_all
+from ragenetics.pipeline.scheduler import DeadlineScheduler, StepPlan
 from ragenetics.privacy.vote import report_noisy_max
 from ragenetics.privacy.accounting import Accountant
+from ragenetics.privacy.sparse_vector import AboveThreshold
 
 
 class DPVoteRAG:
@@ -12,60 +17,206 @@ class DPVoteRAG:
       1) Ask all voters to propose a next token.
       2) Aggregate with noisy max (ε per step).
       3) Spend ε; stop when max_tokens reached, budget exhausted, or EOS token seen.
+
+    Wave mode (0 < wave_size < len(voters)): voters are asked `wave_size` at a
+    time, in fixed order, and collection stops once the leader's margin over
+    the runner-up among the votes so far passes an AboveThreshold test
+    against `stop_margin`. One voter changes that margin by at most 2, so the
+    test runs with sensitivity 2 and costs `epsilon_stop` per step whatever
+    the number of waves; noisy max then runs over the consulted votes only.
+    Each step is charged epsilon_per_vote + epsilon_stop, including a step
+    that ends the answer without releasing a token.
+
+    With a deadline (see DeadlineScheduler), late steps may ask fewer voters,
+    vote on multi-word spans, or end the answer early; each step's ε is
+    charged exactly as it ran.
     """
 
-    def __init__(self, voters: List, epsilon_per_vote: float, delta: float, max_total_epsilon: float):
+    def __init__(
+        self,
+        voters: List,
+        epsilon_per_vote: float,
+        delta: float,
+        max_total_epsilon: float,
+        wave_size: int = 0,
+        epsilon_stop: float = 0.0,
+        stop_margin: float = 3.0,
+        scheduler: Optional[DeadlineScheduler] = None,
+        executor=None,
+        quorum: Optional[int] = None,
+    ):
         """
         Args:
             voters: List of voter objects, each with `propose_next(question, prefix) -> str`.
             epsilon_per_vote: ε spent per noisy max step.
             delta: δ for DP accounting (kept for compatibility if Accountant uses it elsewhere).
             max_total_epsilon: total ε budget available.
+            wave_size: Voters asked per wave; 0 asks all voters at once.
+            epsilon_stop: ε spent per step on the early-stopping test.
+            stop_margin: Vote margin (leader minus runner-up) needed to stop.
+            scheduler: Configured deadline scheduler; each answer runs on a
+                fresh copy (see DeadlineScheduler.begin), and one is created
+                on demand for an answer given a deadline.
+            executor: Optional HedgedExecutor running voter calls concurrently.
+            quorum: Voters consulted per step, drawn at random before the
+                step; None consults all.
         """
         self.voters = voters
         self.eps_vote = float(epsilon_per_vote)
         self.delta = float(delta)
         self.acc = Accountant(max_total_epsilon)
 
-    def generate(self, question: str, max_tokens: int = 256) -> Tuple[str, float]:
+        self.wave_size = int(wave_size)
+        self.stopper = None
+        if 0 < self.wave_size < (quorum or len(voters)) and epsilon_stop > 0:
+            self.stopper = AboveThreshold(stop_margin, epsilon_stop, sensitivity=2.0)
+        self.eps_step = self.eps_vote + (self.stopper.eps if self.stopper else 0.0)
+        self.stats = {"steps": 0, "voters_consulted": 0}
+        self.scheduler = scheduler
+        # Scheduler of the last answer, for `slo`
+        self._last_sched: Optional[DeadlineScheduler] = None
+        self.executor = executor
+        self.committee = len(voters) if quorum is None else max(1, min(int(quorum), len(voters)))
+
+    @property
+    def voters_per_step(self) -> float:
         """
-        Generate text under a DP budget.
+        Mean number of voters consulted per released token.
+        """
+        return self.stats["voters_consulted"] / self.stats["steps"] if self.stats["steps"] else 0.0
 
-        Args:
-            question: The user query.
-            max_tokens: Maximum number of tokens to emit.
+    @property
+    def slo(self) -> Optional[dict]:
+        """
+        SLO metrics of the last answer, if it ran under a deadline.
+        """
+        if self._last_sched is None or self._last_sched.deadline_s is None:
+            return None
+        return self._last_sched.summary()
+
+    def _step_voters(self) -> List:
+        """
+        Voters for one step: all of them, or a uniformly random quorum drawn
+        before any call is made (never "the first k to answer", which would
+        let response timing pick whose vote counts).
+        """
+        if self.committee >= len(self.voters):
+            return self.voters
+        return random.sample(self.voters, self.committee)
+
+    def _collect(self, question: str, prefix: str, plan: StepPlan) -> Tuple[List[str], float]:
+        """
+        Gather proposals for one step, in waves when early stopping is on.
 
         Returns:
-            (text, spent_epsilon)
+            (proposals, ε cost of the step)
         """
-        out: List[str] = []
-        if not self.voters:
-            return "", getattr(self.acc, "spent", 0.0)
+        voters = self._step_voters()[: plan.voters]
+        if plan.span > 1 or self.stopper is None or len(voters) <= self.wave_size:
+            props = propose_all(voters, question, prefix=prefix, span=plan.span, executor=self.executor)
+            return props, self.eps_vote
+
+        self.stopper.start()
+        props: List[str] = []
+        w = self.wave_size
+        for s in range(0, len(voters), w):
+            props += propose_all(voters[s:s + w], question, prefix=prefix, executor=self.executor)
+            if s + w >= len(voters):
+                break
+            top = Counter(p for p in props if isinstance(p, str) and p.strip()).most_common(2) + [("", 0)] * 2
+            if self.stopper.test(top[0][1] - top[1][1]):
+                break
+        return props, self.eps_step
 
-        stop_tokens = {"</s>", "<eos>", "\n"}  # extend as needed
+    def generate_stream(
+        self, question: str, max_tokens: int = 256, deadline: Optional[float] = None
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Generate text under a DP budget, yielding tokens as they are released.
 
-        while len(out) < max_tokens and self.acc.can_spend(self.eps_vote):
-            prefix = " ".join(out)
+        Args:
+            question: The user query.
+            max_tokens: Maximum number of tokens to emit.
+            deadline: Time budget in seconds for this answer only; overrides
+                the configured scheduler's.
 
-            # Collect proposals; skip empty strings to avoid degenerate votes
-            props = [v.propose_next(question, prefix=prefix) for v in self.voters]
-            props = [p for p in props if isinstance(p, str) and p.strip()]
+        Yields:
+            (token, spent_epsilon) after each accepted token.
+        """
+        if not self.voters:
+            return
 
-            # If no voter produced a token, stop early
-            if not props:
-                break
+        sched = None
+        if self.scheduler is not None or deadline is not None:
+            sched = (self.scheduler or DeadlineScheduler()).begin(self.committee, deadline)
+        self._last_sched = sched
+        clock = sched.clock if sched else time.perf_counter
 
-            tok = report_noisy_max(Counter(props), epsilon=self.eps_vote)
+        stop_tokens = {"</s>", "<eos>", "\n"}  # extend as needed
 
-            # Defensive fallback if the voting returns an empty/None token
-            if not tok or not isinstance(tok, str):
-                break
+        # Voters take the prefix as one string. It is grown with `+=`, which
+        # CPython resizes in place while nothing else holds it, so each word
+        # costs amortized O(len(word)) instead of re-joining every step
+        prefix = ""
+        emitted = 0
+        try:
+            while emitted < max_tokens and self.acc.can_spend(self.eps_step):
+                # The remaining ε budget may allow fewer steps than max_tokens
+                affordable = int((self.acc.max_total - self.acc.spent) / self.eps_step + 1e-9)
+                tokens_left = min(max_tokens - emitted, affordable)
+                plan = sched.plan(tokens_left) if sched else StepPlan("full", self.committee)
+                if plan.stage == "stop":
+                    break
+
+                # Collect proposals; skip empty strings to avoid degenerate votes
+                t_step = clock()
+                props, eps = self._collect(question, prefix, plan)
+                consulted = len(props)
+                props = [" ".join(p.split()) for p in props if isinstance(p, str) and p.strip()]
+
+                # If no voter produced a token, stop early. The stop test (if
+                # it ran) has already looked at the votes, so its ε is owed.
+                if not props:
+                    self.acc.spend(eps - self.eps_vote)
+                    break
+
+                tok = report_noisy_max(Counter(props), epsilon=self.eps_vote)
+
+                # Defensive fallback if the voting returns an empty/None token
+                if not tok or not isinstance(tok, str):
+                    self.acc.spend(eps)
+                    break
+
+                self.acc.spend(eps)
+                self.stats["steps"] += 1
+                self.stats["voters_consulted"] += consulted
+                if sched:
+                    sched.record(plan, clock() - t_step)
+
+                # A span releases several words for one vote
+                for word in tok.split()[: max_tokens - emitted]:
+                    prefix += " " + word if emitted else word
+                    emitted += 1
+                    yield word, float(self.acc.spent)
+                    if word in stop_tokens:
+                        return
+        finally:
+            if sched:
+                sched.finish()
+
+    def generate(self, question: str, max_tokens: int = 256, deadline: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Generate text under a DP budget.
 
-            out.append(tok)
-            self.acc.spend(self.eps_vote)
+        Args:
+            question: The user query.
+            max_tokens: Maximum number of tokens to emit.
+            deadline: Time budget in seconds (see generate_stream).
 
-            if tok in stop_tokens:
-                break
+        Returns:
+            (text, spent_epsilon)
+        """
+        out = [tok for tok, _ in self.generate_stream(question, max_tokens=max_tokens, deadline=deadline)]
 
         # Some Accountant implementations track `spent` as an attribute or property
         spent = getattr(self.acc, "spent", 0.0)
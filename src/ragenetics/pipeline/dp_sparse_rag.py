@@ -1,6 +1,10 @@
+import random
+import time
 from collections import Counter
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
+from ragenetics.llm.base import agree_all, propose_all
+from ragenetics.pipeline.scheduler import DeadlineScheduler, StepPlan
 from ragenetics.privacy.vote import report_noisy_max
 from ragenetics.privacy.accounting import Accountant
 from ragenetics.privacy.sparse_vector import SVTGate
@@ -14,6 +18,10 @@ class DPSparseVoteRAG:
         based on voter agreement rate (spends ε from SVT).
       • If SVT rejects, falls back to a DP noisy-max vote among voter proposals
         (spends ε_per_vote).
+
+    Under a deadline (see DeadlineScheduler) late steps use fewer voters for
+    both stages, or skip the baseline and noisy-max vote on multi-word spans
+    (one ε_per_vote per span), or end the answer early.
     """
 
     def __init__(
@@ -23,6 +31,9 @@ class DPSparseVoteRAG:
         epsilon_per_vote: float,
         svt: SVTGate,
         max_total_epsilon: float,
+        scheduler: Optional[DeadlineScheduler] = None,
+        executor=None,
+        quorum: Optional[int] = None,
     ):
         """
         Args:
@@ -32,72 +43,164 @@ class DPSparseVoteRAG:
             epsilon_per_vote: ε spent when using noisy max on voter proposals
             svt: Sparse Vector Technique gate with .decide(score) -> (gate: bool, eps_used: float)
             max_total_epsilon: total ε budget for the whole generate() run
+            scheduler: Configured deadline scheduler; each answer runs on a
+                       fresh copy (see DeadlineScheduler.begin), and one is
+                       created on demand for an answer given a deadline
+            executor: Optional HedgedExecutor running voter calls concurrently
+            quorum: Voters consulted per step, drawn at random before the step;
+                    None consults all
         """
         self.voters = voters
         self.baseline = baseline_llm
         self.eps_vote = float(epsilon_per_vote)
         self.svt = svt
         self.acc = Accountant(max_total_epsilon)
-
-    def generate(self, question: str, max_tokens: int = 256) -> Tuple[str, float]:
+        # Per-step decisions: accepted = baseline token passed the SVT gate
+        self.stats = {"steps": 0, "accepted": 0, "fallbacks": 0, "spans": 0}
+        self.scheduler = scheduler
+        # Scheduler of the last answer, for `slo`
+        self._last_sched: Optional[DeadlineScheduler] = None
+        self.executor = executor
+        self.committee = len(voters) if quorum is None else max(1, min(int(quorum), len(voters)))
+
+    @property
+    def acceptance_rate(self) -> float:
         """
-        Returns:
-            (text, spent_epsilon)
+        Fraction of decoding steps whose token came from the baseline proposer.
         """
-        out: List[str] = []
-        if max_tokens <= 0:
-            return "", float(getattr(self.acc, "spent", 0.0))
-
-        stop_tokens = {"</s>", "<eos>", "\n"}  # extend as needed
-
-        # Loop does not spend by itself; spending happens inside after decisions.
-        while len(out) < max_tokens and self.acc.can_spend(0.0):
-            prefix = " ".join(out)
+        return self.stats["accepted"] / self.stats["steps"] if self.stats["steps"] else 0.0
 
-            # 1) Non-private baseline suggestion
-            t0 = self.baseline.sample_next_token(question, prefix=prefix, ctx=[])
+    @property
+    def slo(self) -> Optional[dict]:
+        """
+        SLO metrics of the last answer, if it ran under a deadline.
+        """
+        if self._last_sched is None or self._last_sched.deadline_s is None:
+            return None
+        return self._last_sched.summary()
 
-            # 2) Private gate on agreement rate via SVT
-            agreements = [int(v.agrees(question, prefix=prefix, candidate=t0)) for v in self.voters]
-            denom = max(len(self.voters), 1)
-            agree_rate = sum(agreements) / denom
+    def _step_voters(self) -> List:
+        """
+        Voters for one step: all of them, or a uniformly random quorum drawn
+        before any call is made (never "the first k to answer", which would
+        let response timing pick whose vote counts).
+        """
+        if self.committee >= len(self.voters):
+            return self.voters
+        return random.sample(self.voters, self.committee)
 
-            gate, eps_used = self.svt.decide(agree_rate)
+    def _noisy_max(self, question: str, prefix: str, voters: List, span: int = 1) -> str:
+        """
+        DP noisy-max vote over voter proposals; spends ε_per_vote. Returns "" to stop.
+        """
+        if not self.acc.can_spend(self.eps_vote):
+            return ""
+        props = propose_all(voters, question, prefix=prefix, span=span, executor=self.executor)
+        props = [" ".join(p.split()) for p in props if isinstance(p, str) and p.strip()]
+        if not props:
+            return ""
+        tok = report_noisy_max(Counter(props), epsilon=self.eps_vote)
+        if not tok or not isinstance(tok, str):
+            return ""
+        self.acc.spend(self.eps_vote)
+        return tok.strip()
+
+    def generate_stream(
+        self, question: str, max_tokens: int = 256, deadline: Optional[float] = None
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Args:
+            deadline: Time budget in seconds for this answer only; overrides
+                the configured scheduler's.
 
-            # Ensure we have budget for this SVT decision
-            if not self.acc.can_spend(eps_used):
-                break
-            self.acc.spend(eps_used)
+        Yields:
+            (token, spent_epsilon) after each accepted token.
+        """
+        if max_tokens <= 0:
+            return
 
-            if gate:
-                # Accept baseline token
-                last_tok = t0.strip()
-                if last_tok:
-                    out.append(last_tok)
-                else:
-                    # If t0 is empty, stop to avoid infinite loop
-                    break
-            else:
-                # 3) Fall back to DP noisy-max vote
-                if not self.acc.can_spend(self.eps_vote):
-                    break
+        sched = None
+        if self.scheduler is not None or deadline is not None:
+            sched = (self.scheduler or DeadlineScheduler()).begin(self.committee, deadline)
+        self._last_sched = sched
+        clock = sched.clock if sched else time.perf_counter
 
-                props = [v.propose_next(question, prefix=prefix) for v in self.voters]
-                props = [p.strip() for p in props if isinstance(p, str) and p.strip()]
-                if not props:
-                    break
+        stop_tokens = {"</s>", "<eos>", "\n"}  # extend as needed
 
-                tok = report_noisy_max(Counter(props), epsilon=self.eps_vote)
-                if not tok or not isinstance(tok, str):
+        # Voters take the prefix as one string. It is grown with `+=`, which
+        # CPython resizes in place while nothing else holds it, so each word
+        # costs amortized O(len(word)) instead of re-joining every step
+        prefix = ""
+        emitted = 0
+
+        try:
+            # Loop does not spend by itself; spending happens inside after decisions.
+            while emitted < max_tokens and self.acc.can_spend(0.0):
+                plan = sched.plan(max_tokens - emitted) if sched else StepPlan("full", self.committee)
+                if plan.stage == "stop":
                     break
-
-                self.acc.spend(self.eps_vote)
-                last_tok = tok.strip()
-                out.append(last_tok)
-
-            # 4) Stop on EOS token
-            if last_tok in stop_tokens:
-                break
+                voters = self._step_voters()[: plan.voters]
+                t_step = clock()
+
+                if plan.span > 1:
+                    # Span stage: skip the baseline and vote on whole spans
+                    last_tok = self._noisy_max(question, prefix, voters, span=plan.span)
+                    if not last_tok:
+                        break
+                    self.stats["spans"] += 1
+                else:
+                    # 1) Non-private baseline suggestion
+                    t0 = self.baseline.sample_next_token(question, prefix=prefix, ctx=[])
+
+                    # 2) Private gate on agreement rate via SVT
+                    votes = agree_all(voters, question, prefix=prefix, candidate=t0, executor=self.executor)
+                    agreements = [int(a) for a in votes]
+                    denom = max(len(voters), 1)
+                    agree_rate = sum(agreements) / denom
+
+                    gate, eps_used = self.svt.decide(agree_rate)
+
+                    # Ensure we have budget for this SVT decision
+                    if not self.acc.can_spend(eps_used):
+                        break
+                    self.acc.spend(eps_used)
+
+                    if gate:
+                        # Accept baseline token
+                        last_tok = t0.strip()
+                        if not last_tok:
+                            # If t0 is empty, stop to avoid infinite loop
+                            break
+                        self.stats["accepted"] += 1
+                    else:
+                        # 3) Fall back to DP noisy-max vote
+                        last_tok = self._noisy_max(question, prefix, voters)
+                        if not last_tok:
+                            break
+                        self.stats["fallbacks"] += 1
+
+                self.stats["steps"] += 1
+                if sched:
+                    sched.record(plan, clock() - t_step)
+
+                for word in last_tok.split()[: max_tokens - emitted]:
+                    prefix += " " + word if emitted else word
+                    emitted += 1
+                    yield word, float(self.acc.spent)
+
+                    # 4) Stop on EOS token
+                    if word in stop_tokens:
+                        return
+        finally:
+            if sched:
+                sched.finish()
+
+    def generate(self, question: str, max_tokens: int = 256, deadline: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Returns:
+            (text, spent_epsilon)
+        """
+        out = [tok for tok, _ in self.generate_stream(question, max_tokens=max_tokens, deadline=deadline)]
 
         spent = float(getattr(self.acc, "spent", 0.0))
         return " ".join(out).strip(), spent
@@ -0,0 +1,314 @@
+import copy
+import itertools
+import json
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ragenetics.genetics.hpo_map import extract_hpo_phrases
+from ragenetics.genetics.variant_utils import find_hgvs
+from ragenetics.llm.base import CALL_METHODS
+from ragenetics.retrieval.rankers import GENE_HINTS
+
+# Explicit HPO identifiers, in addition to lexicon phrase matches
+HPO_ID = re.compile(r"HP:\d{7}")
+_GENE_RE = re.compile(r"\b(" + "|".join(map(re.escape, GENE_HINTS)) + r")\w*\b", re.I)
+
+# Per-process warm stores, keyed by retrieval options and loaded once per worker
+_INDEX_PATH = None
+_STORES: Dict[Tuple, Any] = {}
+
+
+class CountingLLM:
+    """
+    Transparent proxy around an LLM that counts provider calls.
+
+    Only methods the wrapped model actually has are exposed, so capability
+    checks such as hasattr(model, "sample_next_tokens") are unaffected.
+    """
+
+    def __init__(self, inner):
+        self._inner = inner
+        self.calls = 0
+        # Voter calls may run on HedgedExecutor threads
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._inner, name)
+        if name not in CALL_METHODS or not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+def extract_entities(text: str) -> Dict[str, set]:
+    """
+    Extract gene symbols, HPO codes and HGVS variants from text.
+
+    Args:
+        text (str): Input text.
+
+    Returns:
+        Dict[str, set]: {"genes": ..., "hpo": ..., "variants": ...}
+    """
+    return {
+        "genes": {m.upper() for m in _GENE_RE.findall(text)},
+        "hpo": set(extract_hpo_phrases(text)) | set(HPO_ID.findall(text)),
+        "variants": {v.rstrip(".,;:)") for v in find_hgvs(text)},
+    }
+
+
+def entity_recall(expected: Dict[str, Iterable[str]], answer: str) -> Dict[str, Optional[float]]:
+    """
+    Fraction of expected entities of each kind that appear in the answer.
+
+    An entity counts as recalled if it is extracted from the answer (so HPO
+    phrases map to their codes) or occurs in it verbatim, case-insensitively,
+    since emitted tokens are typically lower-cased. Kinds with no expected
+    entities get None.
+    """
+    low = answer.lower()
+    found = extract_entities(answer)
+    out: Dict[str, Optional[float]] = {}
+    for kind in ("genes", "hpo", "variants"):
+        exp = {e.lower() for e in expected.get(kind, ())}
+        got = {e.lower() for e in found[kind]}
+        out[f"{kind}_recall"] = (sum(e in got or e in low for e in exp) / len(exp)) if exp else None
+    return out
+
+
+def load_questions(path: Path) -> List[Dict[str, Any]]:
+    """
+    Load an evaluation question set.
+
+    Accepts JSONL with {"query": ..., "expected": {...}?, "class": ...?} per line,
+    or plain text with one query per line.
+    """
+    items: List[Dict[str, Any]] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            items.append(json.loads(line))
+        else:
+            items.append({"query": line})
+    return items
+
+
+def expand_sweep(name: str, cfg: dict, sweeps: Sequence[str]) -> List[Tuple[str, dict]]:
+    """
+    Expand a config into the cross product of swept parameter values.
+
+    Args:
+        name (str): Base config name.
+        cfg (dict): Base config.
+        sweeps: Strings like "privacy.epsilon_per_vote=0.25,0.5,1.0".
+
+    Returns:
+        List[(name, cfg)]: One entry per parameter combination.
+    """
+    axes = []
+    for spec in sweeps:
+        key, _, values = spec.partition("=")
+        axes.append([(key, _parse_scalar(v)) for v in values.split(",") if v])
+
+    out = []
+    for combo in itertools.product(*axes):
+        variant = copy.deepcopy(cfg)
+        for key, value in combo:
+            node = variant
+            *parents, leaf = key.split(".")
+            for p in parents:
+                node = node.setdefault(p, {})
+            node[leaf] = value
+        suffix = ",".join(f"{k.rsplit('.', 1)[-1]}={v}" for k, v in combo)
+        out.append((f"{name}[{suffix}]" if suffix else name, variant))
+    return out
+
+
+def _parse_scalar(value: str):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _init_worker(index_path: str) -> None:
+    """
+    Pool initializer: load the index once per worker process.
+    """
+    global _INDEX_PATH
+    _INDEX_PATH = index_path
+    _STORES.clear()
+    _worker_store({})
+
+
+def _worker_store(cfg: dict):
+    """
+    Warm store for a config, one per distinct set of retrieval options.
+    """
+    from ragenetics.pipeline.builder import load_store, store_options
+
+    key = store_options(cfg)
+    if key not in _STORES:
+        _STORES[key] = load_store(Path(_INDEX_PATH), **dict(key))
+    return _STORES[key]
+
+
+def evaluate_one(cfg_name: str, cfg: dict, item: Dict[str, Any], store=None) -> Dict[str, Any]:
+    """
+    Run one question under one config and collect metrics.
+
+    Args:
+        cfg_name (str): Label for the config.
+        cfg (dict): Pipeline config.
+        item (dict): Question entry with "query" and optional "expected"/"class".
+        store: Retriever; defaults to the worker's warm store.
+
+    Returns:
+        Dict[str, Any]: One result row.
+    """
+    from ragenetics.llm.local_openai import build_llm
+    from ragenetics.pipeline.builder import DEFAULT_LLM, build_engine, max_tokens_for
+
+    if store is None:
+        store = _worker_store(cfg)
+    query = item["query"]
+    llm = CountingLLM(build_llm(cfg.get("llm") or DEFAULT_LLM))
+    engine = build_engine(cfg, store, llm)
+
+    expected = item.get("expected")
+    if expected is None:
+        # Without labels, score against entities present in the retrieved context
+        k = (cfg.get("retrieval") or {}).get("top_k", 6)
+        expected = extract_entities(query + "\n" + "\n".join(store.similarity_search(query, k=k)))
+
+    t_start = time.perf_counter()
+    ttft = None
+    out: List[str] = []
+    for tok, _ in engine.generate_stream(query, max_tokens=max_tokens_for(cfg)):
+        if ttft is None:
+            ttft = time.perf_counter() - t_start
+        out.append(tok)
+    latency = time.perf_counter() - t_start
+    answer = " ".join(out).strip()
+    slo = engine.slo
+    hedging = engine.executor.summary() if engine.executor is not None else {}
+
+    row = {
+        "config": cfg_name,
+        "scheme": cfg["privacy"]["scheme"],
+        "query": query,
+        "class": item.get("class", ""),
+        "latency_s": latency,
+        "ttft_s": ttft,
+        "llm_calls": llm.calls,
+        # Estimated prompt tokens; the LLM is built per row, so this is per answer
+        "input_tokens": getattr(llm, "input_tokens", None),
+        "tokens": len(out),
+        "eps_spent": float(engine.acc.spent),
+        "svt_acceptance": getattr(engine, "acceptance_rate", None),
+        "voters_per_step": getattr(engine, "voters_per_step", None),
+        "slo_hit": slo["slo_hit"] if slo else None,
+        "degraded": slo["degraded"] if slo else None,
+        "hedges_issued": hedging.get("hedges_issued"),
+        "hedges_won": hedging.get("hedges_won"),
+        "step_p50_s": hedging.get("step_p50_s"),
+        "step_p99_s": hedging.get("step_p99_s"),
+        "answer": answer,
+    }
+    row.update(entity_recall(expected, answer))
+    return row
+
+
+def _evaluate_task(task: Tuple[str, dict, Dict[str, Any]]) -> Dict[str, Any]:
+    return evaluate_one(*task)
+
+
+def run_eval(
+    questions: Sequence[Dict[str, Any]],
+    configs: Sequence[Tuple[str, dict]],
+    index_path: Path,
+    workers: int = 0,
+):
+    """
+    Evaluate every (config, question) pair, in parallel across processes.
+
+    Each worker loads the index once and keeps it warm for all its tasks.
+
+    Args:
+        questions: Question entries (see `load_questions`).
+        configs: (name, cfg) pairs (see `expand_sweep`).
+        index_path (Path): Serialized BM25 index.
+        workers (int): Process count; 0 or 1 runs in-process.
+
+    Returns:
+        pandas.DataFrame: One row per (config, question).
+    """
+    import pandas as pd
+
+    tasks = [(name, cfg, item) for name, cfg in configs for item in questions]
+    if workers <= 1:
+        _init_worker(str(index_path))
+        rows = [_evaluate_task(t) for t in tasks]
+    else:
+        chunk = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(str(index_path),)) as ex:
+            rows = list(ex.map(_evaluate_task, tasks, chunksize=chunk))
+
+    df = pd.DataFrame(rows)
+    for col in ("genes_recall", "hpo_recall", "variants_recall"):
+        if col in df:
+            df[col] = pd.to_numeric(df[col])
+    return df
+
+
+def write_results(df, path: Path) -> Path:
+    """
+    Write results in a columnar format chosen by file suffix.
+
+    .parquet and .feather/.arrow need pyarrow; anything else is written as CSV.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    elif suffix in {".feather", ".arrow"}:
+        df.to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def summarize(df):
+    """
+    Aggregate per-config means and latency percentiles.
+    """
+    g = df.groupby("config")
+    out = g.agg(
+        queries=("query", "count"),
+        latency_p50=("latency_s", "median"),
+        latency_p95=("latency_s", lambda s: s.quantile(0.95)),
+        llm_calls=("llm_calls", "mean"),
+        input_tokens=("input_tokens", "mean"),
+        tokens=("tokens", "mean"),
+        eps_spent=("eps_spent", "mean"),
+    )
+    for col in ("genes_recall", "hpo_recall", "variants_recall"):
+        out[col] = g[col].mean()
+    if "slo_hit" in df:
+        # NaN for configs without a deadline
+        out["slo_hit_rate"] = df["slo_hit"].astype(float).groupby(df["config"]).mean()
+    return out
@@ -0,0 +1,229 @@
+"""
+Open-loop load generation against the pipeline.
+
+Requests arrive on a Poisson schedule fixed in advance, independent of how
+fast earlier ones finish, so a slow pipeline builds a queue instead of
+quietly lowering the offered load. Latency is measured from each request's
+scheduled arrival, which includes time spent waiting in that queue.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ragenetics.llm.base import CALL_METHODS
+
+# Handler: query -> {"tokens": int, "eps_spent": float, "ttft_s": float | None}
+Handler = Callable[[str], Dict[str, Any]]
+
+
+class DelayedLLM:
+    """
+    Proxy that adds a simulated provider round trip to every LLM call.
+
+    Stands in for a network-bound model: latency is lognormal around
+    `rtt_s`, and sleeping releases the GIL like a real HTTP call would.
+    """
+
+    def __init__(self, inner, rtt_s: float, jitter: float = 0.3, seed: Optional[int] = None):
+        self._inner = inner
+        self.rtt_s = float(rtt_s)
+        self.jitter = float(jitter)
+        self._rng = random.Random(seed)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._inner, name)
+        if name not in CALL_METHODS or not callable(attr) or self.rtt_s <= 0:
+            return attr
+
+        def delayed(*args, **kwargs):
+            time.sleep(self.rtt_s * self._rng.lognormvariate(0.0, self.jitter))
+            return attr(*args, **kwargs)
+
+        return delayed
+
+
+def poisson_arrivals(rate: float, duration: float, seed: int = 0) -> List[float]:
+    """
+    Arrival offsets (seconds) of a Poisson process over [0, duration).
+    """
+    rng = random.Random(seed)
+    out: List[float] = []
+    t = rng.expovariate(rate) if rate > 0 else duration
+    while t < duration:
+        out.append(t)
+        t += rng.expovariate(rate)
+    return out
+
+
+def engine_handler(cfg: dict, store, llm=None, executor=None) -> Handler:
+    """
+    Handler that answers each query with a fresh engine (fresh ε budget).
+    """
+    from ragenetics.pipeline.builder import build_engine, max_tokens_for
+
+    max_tokens = max_tokens_for(cfg)
+
+    def handle(query: str) -> Dict[str, Any]:
+        engine = build_engine(cfg, store, llm, executor=executor)
+        t = time.perf_counter()
+        ttft = None
+        tokens = 0
+        for _ in engine.generate_stream(query, max_tokens=max_tokens):
+            if ttft is None:
+                ttft = time.perf_counter() - t
+            tokens += 1
+        return {"tokens": tokens, "eps_spent": float(engine.acc.spent), "ttft_s": ttft}
+
+    return handle
+
+
+def http_handler(url: str, timeout: float = 60.0) -> Handler:
+    """
+    Handler that POSTs each query to a running `ragenetics serve` endpoint.
+    """
+    import json
+    import urllib.request
+
+    def handle(query: str) -> Dict[str, Any]:
+        req = urllib.request.Request(
+            url,
+            data=json.dumps({"query": query}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            body = json.loads(r.read())
+        return {"tokens": len(body["answer"].split()), "eps_spent": body["eps_spent"], "ttft_s": None}
+
+    return handle
+
+
+def run_load(
+    handler: Handler,
+    queries: Sequence[str],
+    rate: float,
+    duration: float,
+    workers: int = 8,
+    seed: int = 0,
+    sample_every: float = 0.05,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[float, int, int]]]:
+    """
+    Replay `queries` (cycling in order) at a Poisson `rate` for `duration`.
+
+    Args:
+        handler: Callable serving one query.
+        queries: Query stream to replay.
+        rate (float): Mean arrivals per second.
+        duration (float): Arrival window in seconds; in-flight requests are
+            drained afterwards.
+        workers (int): Concurrent requests served; arrivals beyond this queue.
+        seed (int): Seed for the arrival schedule.
+        sample_every (float): Queue-depth sampling interval in seconds.
+
+    Returns:
+        (records, depth): One record per request (times relative to start)
+        and (t, queued, in_flight) samples.
+    """
+    arrivals = poisson_arrivals(rate, duration, seed)
+    records: List[Dict[str, Any]] = [{} for _ in arrivals]
+    lock = threading.Lock()
+    counts = {"submitted": 0, "started": 0, "finished": 0}
+    depth: List[Tuple[float, int, int]] = []
+    t0 = time.perf_counter()
+
+    def serve(i: int) -> None:
+        start = time.perf_counter() - t0
+        with lock:
+            counts["started"] += 1
+        rec = {"arrival_s": arrivals[i], "start_s": start, "query": queries[i % len(queries)], "error": None}
+        try:
+            rec.update(handler(rec["query"]))
+        except Exception as e:  # keep the load running; errors are reported per request
+            rec["error"] = repr(e)
+        rec["end_s"] = time.perf_counter() - t0
+        rec["latency_s"] = rec["end_s"] - rec["arrival_s"]
+        records[i] = rec
+        with lock:
+            counts["finished"] += 1
+
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.is_set():
+            with lock:
+                c = dict(counts)
+            depth.append((time.perf_counter() - t0, c["submitted"] - c["started"], c["started"] - c["finished"]))
+            done.wait(sample_every)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="load") as pool:
+        for i, a in enumerate(arrivals):
+            wait = t0 + a - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            with lock:
+                counts["submitted"] += 1
+            pool.submit(serve, i)
+    done.set()
+    sampler.join()
+    return records, depth
+
+
+def _pct(values: Sequence[float], q: float) -> Optional[float]:
+    return float(np.quantile(values, q)) if len(values) else None
+
+
+def summarize_load(
+    records: Sequence[Dict[str, Any]],
+    depth: Sequence[Tuple[float, int, int]],
+    duration: float,
+    window: float = 1.0,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Overall and per-window load metrics.
+
+    Windows are keyed by completion time; queue depth is the max sampled in
+    each window.
+
+    Returns:
+        (overall, windows): throughput, latency percentiles, errors, peak
+        queue depth and ε per second, overall and per window.
+    """
+    ok = [r for r in records if r.get("error") is None]
+    lat = [r["latency_s"] for r in ok]
+    span = max([duration] + [r["end_s"] for r in records])
+    overall = {
+        "requests": len(records),
+        "errors": len(records) - len(ok),
+        "offered_rps": len(records) / duration if duration else 0.0,
+        "throughput_rps": len(ok) / span if span else 0.0,
+        "latency_p50_s": _pct(lat, 0.5),
+        "latency_p95_s": _pct(lat, 0.95),
+        "latency_p99_s": _pct(lat, 0.99),
+        "ttft_p50_s": _pct([r["ttft_s"] for r in ok if r.get("ttft_s") is not None], 0.5),
+        "max_queue": max((q for _, q, _ in depth), default=0),
+        "eps_per_s": sum(r["eps_spent"] for r in ok) / span if span else 0.0,
+    }
+
+    windows = []
+    for w in range(int(np.ceil(span / window))):
+        lo, hi = w * window, (w + 1) * window
+        done = [r for r in ok if lo <= r["end_s"] < hi]
+        wl = [r["latency_s"] for r in done]
+        windows.append(
+            {
+                "t_s": lo,
+                "arrivals": sum(lo <= r["arrival_s"] < hi for r in records),
+                "completed": len(done),
+                "throughput_rps": len(done) / window,
+                "latency_p50_s": _pct(wl, 0.5),
+                "latency_p99_s": _pct(wl, 0.99),
+                "max_queue": max((q for t, q, _ in depth if lo <= t < hi), default=0),
+                "eps_per_s": sum(r["eps_spent"] for r in done) / window,
+            }
+        )
+    return overall, windows
@@ -0,0 +1,326 @@
+"""
+Incremental run-log analytics.
+
+Run logs are read line by line in constant memory: each (config, scheme,
+query class) group keeps a `DDSketch` per metric instead of the raw values,
+so percentiles stay cheap however large the logs grow. Rotated segments
+(`last_run.jsonl.1`, `last_run.jsonl.2.gz`, ...) are scanned in parallel and
+their sketches merged.
+
+A checkpoint records how far each segment has been read together with the
+merged state, so a re-run only reads lines appended since. Segments are
+identified by a hash of their first line rather than by path, so a live log
+that is rotated and compressed resumes where it left off instead of being
+counted twice.
+"""
+import gzip
+import json
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ragenetics.utils.hashing import sha1
+from ragenetics.utils.sketch import DDSketch
+
+METRICS = ("eps_spent", "latency_s", "ttft_s", "tokens")
+GROUP_FIELDS = ("config", "scheme", "class")
+
+Group = Tuple[str, str, str]
+
+
+@lru_cache(maxsize=4096)
+def query_class(query: str) -> str:
+    """
+    Coarse query class from the entities a query mentions:
+    "variant", "gene", "phenotype" or "other". Used for entries that carry
+    no "class" of their own.
+    """
+    from ragenetics.pipeline.eval import extract_entities
+
+    found = extract_entities(query)
+    for cls, kind in (("variant", "variants"), ("gene", "genes"), ("phenotype", "hpo")):
+        if found[kind]:
+            return cls
+    return "other"
+
+
+class RunLogStats:
+    """
+    Mergeable per-group run statistics.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Args:
+            relative_accuracy (float): Relative error bound of the percentile sketches.
+        """
+        self.relative_accuracy = float(relative_accuracy)
+        self.groups: Dict[Group, Dict[str, Any]] = {}
+        self.malformed = 0
+
+    def _group(self, key: Group) -> Dict[str, Any]:
+        g = self.groups.get(key)
+        if g is None:
+            g = {"runs": 0, "slo_runs": 0, "slo_hits": 0}
+            g.update({m: DDSketch(self.relative_accuracy) for m in METRICS})
+            self.groups[key] = g
+        return g
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """
+        Count one run log entry. Entries with a non-dict "slo" or a
+        non-finite metric (json parses NaN and Infinity) count as malformed.
+        """
+        slo = entry.get("slo")
+        if slo is not None and not isinstance(slo, dict):
+            self.malformed += 1
+            return
+        values = []
+        for m in METRICS:
+            v = entry.get(m)
+            if v is not None and v.__class__ in (int, float):
+                if not math.isfinite(v):
+                    self.malformed += 1
+                    return
+                values.append((m, v))
+        key = (
+            str(entry.get("config") or "unknown"),
+            str(entry.get("scheme") or "unknown"),
+            str(entry.get("class") or query_class(entry.get("query") or "")),
+        )
+        g = self._group(key)
+        g["runs"] += 1
+        for m, v in values:
+            g[m].add(v)
+        if slo:
+            g["slo_runs"] += 1
+            g["slo_hits"] += bool(slo.get("slo_hit"))
+
+    def merge(self, other: "RunLogStats") -> "RunLogStats":
+        """
+        Add another summary's groups into this one (in place).
+        """
+        for key, og in other.groups.items():
+            self._merge_group(key, og)
+        self.malformed += other.malformed
+        return self
+
+    def _merge_group(self, key: Group, other: Dict[str, Any]) -> None:
+        g = self._group(key)
+        for name, value in other.items():
+            if isinstance(value, DDSketch):
+                g[name].merge(value)
+            else:
+                g[name] += value
+
+    @property
+    def runs(self) -> int:
+        return sum(g["runs"] for g in self.groups.values())
+
+    def summary(self, by: Sequence[str] = GROUP_FIELDS, quantiles: Sequence[float] = (0.5, 0.95, 0.99)) -> List[Dict[str, Any]]:
+        """
+        One row per group, rolled up to the fields in `by`.
+
+        Args:
+            by: Subset of ("config", "scheme", "class"); empty for a single total row.
+            quantiles: Percentiles reported for each metric.
+
+        Returns:
+            List[Dict[str, Any]]: Rows with runs, SLO hit rate, and mean,
+            percentiles and max of each metric.
+        """
+        unknown = [f for f in by if f not in GROUP_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown group fields {unknown}; expected a subset of {GROUP_FIELDS}")
+        idx = [GROUP_FIELDS.index(f) for f in by]
+        rolled = RunLogStats(self.relative_accuracy)
+        for key, g in self.groups.items():
+            rolled._merge_group(tuple(k if i in idx else "" for i, k in enumerate(key)), g)
+
+        rows = []
+        for key in sorted(rolled.groups):
+            g = rolled.groups[key]
+            row: Dict[str, Any] = {f: key[GROUP_FIELDS.index(f)] for f in by}
+            row["runs"] = g["runs"]
+            row["slo_hit_rate"] = g["slo_hits"] / g["slo_runs"] if g["slo_runs"] else None
+            for m in METRICS:
+                s = g[m]
+                row[f"{m}_mean"] = s.mean
+                for q in quantiles:
+                    row[f"{m}_p{round(q * 100)}"] = s.quantile(q)
+                row[f"{m}_max"] = s.max if s.count else None
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "malformed": self.malformed,
+            "groups": [
+                {
+                    "key": list(key),
+                    **{k: v.to_dict() if isinstance(v, DDSketch) else v for k, v in g.items()},
+                }
+                for key, g in self.groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "RunLogStats":
+        stats = cls(d["relative_accuracy"])
+        stats.malformed = int(d["malformed"])
+        for g in d["groups"]:
+            key = tuple(g.pop("key"))
+            stats.groups[key] = {k: DDSketch.from_dict(v) if k in METRICS else v for k, v in g.items()}
+        return stats
+
+
+def find_segments(paths: Iterable[Path]) -> List[Path]:
+    """
+    Expand log paths into segment files.
+
+    A directory contributes its *.jsonl and *.jsonl.gz files; a file also
+    brings along its rotated siblings (name.1, name.2.gz, name-20260101.gz).
+    """
+    out: List[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            out += sorted(p.glob("*.jsonl")) + sorted(p.glob("*.jsonl.gz"))
+            continue
+        rotated = re.compile(re.escape(p.name) + r"([.-]\d+)?(\.gz)?$")
+        if p.parent.is_dir():
+            out += sorted(q for q in p.parent.iterdir() if q.is_file() and rotated.fullmatch(q.name))
+    return list(dict.fromkeys(out))
+
+
+def _open(path: Path):
+    return gzip.open(path, "rb") if path.name.endswith(".gz") else open(path, "rb")
+
+
+def fingerprint(path: Path) -> Optional[str]:
+    """
+    Hash of a segment's first complete line, or None if it has none yet.
+    """
+    with _open(path) as f:
+        line = f.readline()
+    if not line.endswith(b"\n"):
+        return None
+    return sha1(line.decode("utf-8", errors="replace"))
+
+
+def scan_segment(path: str, offset: int = 0, relative_accuracy: float = 0.01) -> Tuple[int, RunLogStats]:
+    """
+    Summarize the complete lines of one segment from `offset` on.
+
+    Offsets are in uncompressed bytes. A trailing line still being written
+    is left for the next scan.
+
+    Returns:
+        (offset after the last complete line, stats for the lines read)
+    """
+    stats = RunLogStats(relative_accuracy)
+    with _open(Path(path)) as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                stats.malformed += 1
+                continue
+            if isinstance(entry, dict):
+                stats.add(entry)
+            else:
+                stats.malformed += 1
+    return offset, stats
+
+
+def _scan_task(task: Tuple[str, int, float]) -> Tuple[int, RunLogStats]:
+    return scan_segment(*task)
+
+
+def load_checkpoint(path: Optional[Path], relative_accuracy: float = 0.01) -> Tuple[Dict[str, Dict[str, Any]], RunLogStats]:
+    """
+    Segment positions and merged stats from a checkpoint, or a fresh start.
+    """
+    if path is None or not Path(path).exists():
+        return {}, RunLogStats(relative_accuracy)
+    d = json.loads(Path(path).read_text(encoding="utf-8"))
+    return d["segments"], RunLogStats.from_dict(d["stats"])
+
+
+def save_checkpoint(path: Path, segments: Dict[str, Dict[str, Any]], stats: RunLogStats) -> None:
+    """
+    Atomically write segment positions and merged stats.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"segments": segments, "stats": stats.to_dict()}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def update(
+    paths: Sequence[Path],
+    checkpoint: Optional[Path] = None,
+    workers: Optional[int] = None,
+    relative_accuracy: float = 0.01,
+) -> RunLogStats:
+    """
+    Bring run-log stats up to date, reading only what is new since the checkpoint.
+
+    Args:
+        paths: Log files or directories; rotated siblings of files are included.
+        checkpoint (Path | None): Checkpoint to resume from and rewrite; None
+            reads everything and keeps no state.
+        workers (int | None): Processes for scanning segments; None = CPU
+            count, 0 = in-process.
+        relative_accuracy (float): Sketch accuracy for a fresh start.
+
+    Returns:
+        RunLogStats: Stats over every line read so far.
+
+    Segments whose files are gone are dropped from the checkpoint (their
+    lines stay counted), so it does not grow with every rotation. A
+    checkpoint therefore belongs to one set of `paths`.
+    """
+    segments, stats = load_checkpoint(checkpoint, relative_accuracy)
+    tasks: List[Tuple[str, int, float]] = []
+    pending: List[Tuple[str, int, str]] = []
+    present = set()
+    for p in find_segments(paths):
+        fp = fingerprint(p)
+        if fp is None:
+            continue
+        present.add(fp)
+        size = p.stat().st_size
+        seen = segments.get(fp, {"offset": 0, "size": -1})
+        if seen["size"] == size:
+            # Unchanged since the last scan (compressed size for .gz)
+            continue
+        offset = seen["offset"]
+        if not p.name.endswith(".gz") and size < offset:
+            # Truncated in place: start over
+            offset = 0
+        tasks.append((str(p), offset, stats.relative_accuracy))
+        pending.append((fp, size, str(p)))
+
+    if workers == 0 or len(tasks) <= 1:
+        results = [_scan_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_task, tasks))
+
+    for (fp, size, path), (offset, part) in zip(pending, results):
+        stats.merge(part)
+        segments[fp] = {"offset": offset, "size": size, "path": path}
+    segments = {fp: seg for fp, seg in segments.items() if fp in present}
+
+    if checkpoint is not None:
+        save_checkpoint(checkpoint, segments, stats)
+    return stats
@@ -0,0 +1,175 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+# Degradation order as the deadline approaches
+STAGES = ("full", "reduced", "span", "stop")
+
+
+@dataclass(frozen=True)
+class StepPlan:
+    """
+    What the next decoding step should do.
+
+    Attributes:
+        stage: One of STAGES.
+        voters: Number of voters to consult (a fixed prefix of the voter list).
+        span: Words each voter proposes; >1 releases a whole span per vote.
+    """
+
+    stage: str
+    voters: int
+    span: int = 1
+
+
+class DeadlineScheduler:
+    """
+    Plans decoding steps against a wall-clock deadline.
+
+    Per-step latency is tracked per stage (exponential moving average). Each
+    step runs in the cheapest-to-degrade stage that is still expected to
+    finish the remaining tokens in time:
+
+      full     all voters, one token per step
+      reduced  the first `reduced_fraction` of voters, one token per step
+      span     reduced voters, each proposing `span_tokens` words at once
+      stop     end cleanly with the partial answer
+
+    Stages only change how many voters are asked and what they propose, and
+    depend on elapsed time alone, never on votes; every step still pays its
+    full ε, so accounting is unchanged.
+
+    An engine keeps one configured scheduler and runs each answer on a fresh
+    copy from `begin()`, so per-answer state and deadline overrides never
+    leak into later answers.
+    """
+
+    def __init__(
+        self,
+        deadline_s: Optional[float] = None,
+        reduced_fraction: float = 0.5,
+        span_tokens: int = 4,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Args:
+            deadline_s (float | None): Time budget per answer; None = no deadline.
+            reduced_fraction (float): Share of voters kept in degraded stages.
+            span_tokens (int): Words per vote in the span stage.
+            smoothing (float): Weight of the newest sample in latency averages.
+            clock: Monotonic time source in seconds (injectable for tests).
+        """
+        self.deadline_s = None if deadline_s is None else float(deadline_s)
+        self.reduced_fraction = float(reduced_fraction)
+        self.span_tokens = max(1, int(span_tokens))
+        self.smoothing = float(smoothing)
+        self.clock = clock
+        self.start(0)
+
+    def begin(self, n_voters: int, deadline_s: Optional[float] = None) -> "DeadlineScheduler":
+        """
+        A started copy of this scheduler for one answer.
+
+        Args:
+            n_voters (int): Size of the engine's voter committee.
+            deadline_s (float | None): Deadline for this answer only; None
+                keeps the configured one.
+        """
+        sched = DeadlineScheduler(
+            self.deadline_s if deadline_s is None else deadline_s,
+            reduced_fraction=self.reduced_fraction,
+            span_tokens=self.span_tokens,
+            smoothing=self.smoothing,
+            clock=self.clock,
+        )
+        sched.start(n_voters)
+        return sched
+
+    def start(self, n_voters: int) -> None:
+        """
+        Reset for a new answer; the clock starts now.
+
+        Args:
+            n_voters (int): Size of the engine's voter committee.
+        """
+        self.n_voters = int(n_voters)
+        self.reduced_voters = max(1, math.ceil(self.n_voters * self.reduced_fraction))
+        self.steps = {s: 0 for s in STAGES[:-1]}
+        self.stopped_early = False
+        self._est: Dict[str, float] = {}
+        self._per_voter: Optional[float] = None
+        self._t0 = self.clock()
+        self._elapsed: Optional[float] = None
+
+    def elapsed(self) -> float:
+        if self._elapsed is not None:
+            return self._elapsed
+        return self.clock() - self._t0
+
+    def _estimate(self, stage: str) -> float:
+        if stage in self._est:
+            return self._est[stage]
+        if self._per_voter is None:
+            return 0.0
+        # Unseen stage: scale the observed per-voter cost
+        return self._per_voter * (self.n_voters if stage == "full" else self.reduced_voters)
+
+    def plan(self, tokens_left: int) -> StepPlan:
+        """
+        Choose the stage for the next step.
+
+        Args:
+            tokens_left (int): Tokens still allowed for this answer.
+        """
+        full = StepPlan("full", self.n_voters)
+        if self.deadline_s is None:
+            return full
+
+        left = self.deadline_s - self.elapsed()
+        if left > 0:
+            if self._estimate("full") * tokens_left <= left:
+                return full
+            if self._estimate("reduced") * tokens_left <= left:
+                return StepPlan("reduced", self.reduced_voters)
+            if self._estimate("span") <= left:
+                return StepPlan("span", self.reduced_voters, min(self.span_tokens, tokens_left))
+        self.stopped_early = True
+        return StepPlan("stop", 0)
+
+    def record(self, plan: StepPlan, seconds: float) -> None:
+        """
+        Feed back the measured latency of a step run under `plan`.
+        """
+        a = self.smoothing
+        prev = self._est.get(plan.stage)
+        self._est[plan.stage] = seconds if prev is None else a * seconds + (1 - a) * prev
+        per_voter = seconds / max(plan.voters, 1)
+        self._per_voter = per_voter if self._per_voter is None else a * per_voter + (1 - a) * self._per_voter
+        self.steps[plan.stage] += 1
+
+    def finish(self) -> None:
+        """
+        Stop the clock for this answer.
+        """
+        self._elapsed = self.clock() - self._t0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Per-request SLO metrics.
+
+        Returns:
+            Dict[str, Any]: deadline_s, elapsed_s, slo_hit, degraded (any step
+            below full), stopped_early (answer cut by the deadline) and steps
+            per stage.
+        """
+        elapsed = self.elapsed()
+        return {
+            "deadline_s": self.deadline_s,
+            "elapsed_s": elapsed,
+            "slo_hit": self.deadline_s is None or elapsed <= self.deadline_s,
+            "degraded": any(n for s, n in self.steps.items() if s != "full"),
+            "stopped_early": self.stopped_early,
+            "steps": dict(self.steps),
+        }
@@ -35,3 +35,40 @@ class SVTGate:
         mech = LaplaceMechanism(sensitivity=1.0, epsilon=self.eps_gate)
         noisy_agree = float(agreement) + float(mech.noise())
         return noisy_agree >= self.threshold, self.eps_gate
+
+
+class AboveThreshold:
+    """
+    AboveThreshold (Dwork & Roth, Alg. 1): answers a stream of queries with
+    "below" until the first noisy value clears a noisy threshold, then halts.
+
+    One run costs `epsilon` in total, however many queries it answers. Call
+    `start()` to begin a new run (fresh threshold noise, charged again).
+    """
+
+    def __init__(self, threshold: float, epsilon: float, sensitivity: float = 1.0):
+        """
+        Args:
+            threshold (float): Value a query must exceed to halt the run.
+            epsilon (float): ε spent per run.
+            sensitivity (float): L1 sensitivity of each query.
+        """
+        self.threshold = float(threshold)
+        self.eps = float(epsilon)
+        self.sens = float(sensitivity)
+        self._noisy_threshold = self.threshold
+
+    def start(self) -> None:
+        """
+        Begin a new run by drawing fresh threshold noise.
+        """
+        mech = LaplaceMechanism(sensitivity=2.0 * self.sens, epsilon=self.eps)
+        self._noisy_threshold = self.threshold + float(mech.noise())
+
+    def test(self, value: float) -> bool:
+        """
+        Returns:
+            bool: True if the noisy value clears the noisy threshold (halt).
+        """
+        mech = LaplaceMechanism(sensitivity=4.0 * self.sens, epsilon=self.eps)
+        return float(value) + float(mech.noise()) >= self._noisy_threshold
@@ -1,12 +1,25 @@
+import gzip
+import json
 from pathlib import Path
 from typing import List, Dict
 
 
+def _chunk(doc_id: str, text: str, chunk_size: int, overlap: int, docs: List[Dict[str, str]]) -> None:
+    i = 0
+    while i < len(text):
+        docs.append({"id": f"{doc_id}:{i}", "text": text[i:i + chunk_size]})
+        i += max(1, chunk_size - overlap)
+
+
 def read_and_chunk_dir(root: Path, chunk_size: int = 1200, overlap: int = 100) -> List[Dict[str, str]]:
     """
     Recursively read all .txt and .md files under `root`, chunk them into
     overlapping pieces, and return a list of {"id": ..., "text": ...} dicts.
 
+    JSONL files (.jsonl, or gzipped .jsonl.gz) are read as one document per
+    line with a "text" field and optional "id", as written by
+    scripts/make_synthetic_reports.py.
+
     Args:
         root (Path): Root directory to search.
         chunk_size (int): Number of characters per chunk.
@@ -18,11 +31,19 @@ def read_and_chunk_dir(root: Path, chunk_size: int = 1200, overlap: int = 100) -
     docs: List[Dict[str, str]] = []
 
     for p in sorted(root.glob("**/*")):
-        if p.is_file() and p.suffix.lower() in {".txt", ".md"}:
+        if not p.is_file():
+            continue
+        name = p.name.lower()
+        if p.suffix.lower() in {".txt", ".md"}:
             text = p.read_text(encoding="utf-8", errors="ignore")
-            i = 0
-            while i < len(text):
-                docs.append({"id": f"{p.name}:{i}", "text": text[i:i + chunk_size]})
-                i += max(1, chunk_size - overlap)
+            _chunk(p.name, text, chunk_size, overlap, docs)
+        elif name.endswith((".jsonl", ".jsonl.gz")):
+            opener = gzip.open if name.endswith(".gz") else open
+            with opener(p, "rt", encoding="utf-8", errors="ignore") as f:
+                for n, line in enumerate(f):
+                    if not line.strip():
+                        continue
+                    rec = json.loads(line)
+                    _chunk(str(rec.get("id", f"{p.name}#{n}")), rec.get("text", ""), chunk_size, overlap, docs)
 
     return docs
@@ -0,0 +1,263 @@
+import zlib
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from ragenetics.retrieval.tokenizer import TOKEN_RE
+
+
+def _hash_tokens(text: str, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash tokens of a text into (feature index, signed count) arrays.
+
+    crc32 keeps the hashing stable across processes, unlike hash().
+    """
+    counts = {}
+    for tok in TOKEN_RE.findall(text.lower()):
+        h = zlib.crc32(tok.encode("utf-8"))
+        j = h % n_features
+        counts[j] = counts.get(j, 0.0) + (1.0 if (h >> 31) & 1 else -1.0)
+    idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    val = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    return idx, val
+
+
+class HashingSVDEncoder:
+    """
+    Offline CPU text encoder: hashed TF-IDF followed by truncated SVD (LSA).
+
+    Captures term co-occurrence, so paraphrases that share few exact words
+    with the query can still land close to it.
+    """
+
+    def __init__(self, n_features: int = 2**14, dim: int = 128, seed: int = 0):
+        """
+        Args:
+            n_features (int): Hashing space size.
+            dim (int): Embedding dimension (capped by corpus size at fit time).
+            seed (int): Seed for the SVD solver.
+        """
+        self.n_features = int(n_features)
+        self.dim = int(dim)
+        self.seed = int(seed)
+        self.idf = np.ones(self.n_features, dtype=np.float32)
+        self.components = np.zeros((0, self.n_features), dtype=np.float16)
+
+    def _tf(self, texts: Sequence[str]):
+        from scipy import sparse
+
+        rows, cols, vals = [], [], []
+        for r, text in enumerate(texts):
+            idx, val = _hash_tokens(text, self.n_features)
+            rows.append(np.full(len(idx), r, dtype=np.int64))
+            cols.append(idx)
+            vals.append(val)
+        if not rows:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        x = sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(texts), self.n_features),
+            dtype=np.float32,
+        )
+        # Sublinear TF, keeping the hash sign
+        x.data = np.sign(x.data) * (1.0 + np.log(np.abs(x.data)))
+        return x
+
+    def fit(self, texts: Sequence[str]) -> "HashingSVDEncoder":
+        """
+        Learn IDF weights and the SVD projection from a corpus.
+        """
+        from scipy.sparse.linalg import svds
+
+        x = self._tf(texts)
+        df = np.bincount(x.indices, minlength=self.n_features)
+        self.idf = (np.log((1.0 + x.shape[0]) / (1.0 + df)) + 1.0).astype(np.float32)
+        x = x.multiply(self.idf).tocsr()
+
+        if min(x.shape) <= 1:
+            # svds needs 0 < k < min(shape); a single row is cheap to decompose densely
+            _, _, vt = np.linalg.svd(x.toarray(), full_matrices=False)
+            self.components = vt[: self.dim].astype(np.float16)
+            return self
+        k = max(1, min(self.dim, min(x.shape) - 1))
+        _, _, vt = svds(x, k=k, random_state=self.seed)
+        self.components = vt[::-1].astype(np.float16)
+        return self
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Encode texts to L2-normalized float32 embeddings.
+        """
+        x = self._tf(texts).multiply(self.idf).tocsr()
+        emb = np.asarray(x @ self.components.T.astype(np.float32), dtype=np.float32)
+        norms = np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb / np.maximum(norms, 1e-12)
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over normalized embeddings (inner product).
+
+    Vectors are clustered with spherical k-means; a query scans only the
+    `nprobe` closest lists. Vectors are stored as float16 or int8 with a
+    per-vector scale.
+    """
+
+    def __init__(self, n_lists: int = 0, nprobe: int = 8, dtype: str = "float16", seed: int = 0):
+        """
+        Args:
+            n_lists (int): Number of clusters; 0 = about sqrt(N).
+            nprobe (int): Lists scanned per query.
+            dtype (str): "float16" or "int8" vector storage.
+            seed (int): Seed for k-means initialization.
+        """
+        if dtype not in {"float16", "int8"}:
+            raise ValueError(f"unsupported dtype: {dtype}")
+        self.n_lists = int(n_lists)
+        self.nprobe = int(nprobe)
+        self.dtype = dtype
+        self.seed = int(seed)
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.vectors = np.zeros((0, 0), dtype=np.float16)
+        self.scales = np.ones(0, dtype=np.float32)
+        self.members = np.zeros(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+    def fit(self, emb: np.ndarray, iters: int = 10) -> "IVFIndex":
+        """
+        Cluster embeddings and store them list by list.
+        """
+        n = emb.shape[0]
+        if not n:
+            return self
+        n_lists = self.n_lists or int(np.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+        rng = np.random.default_rng(self.seed)
+        cent = emb[rng.choice(n, size=n_lists, replace=False)].copy()
+
+        assign = np.zeros(n, dtype=np.int64)
+        for _ in range(iters):
+            assign = self._assign(emb, cent)
+            sums = np.zeros_like(cent)
+            np.add.at(sums, assign, emb)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            cent = np.where(norms > 0, sums / np.maximum(norms, 1e-12), cent)
+
+        self.centroids = cent.astype(np.float32)
+        self.members = np.argsort(assign, kind="stable")
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))]).astype(np.int64)
+        self._store_vectors(emb)
+        return self
+
+    @staticmethod
+    def _assign(emb: np.ndarray, cent: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        out = np.empty(emb.shape[0], dtype=np.int64)
+        for s in range(0, emb.shape[0], chunk):
+            out[s:s + chunk] = np.argmax(emb[s:s + chunk] @ cent.T, axis=1)
+        return out
+
+    def _store_vectors(self, emb: np.ndarray) -> None:
+        if self.dtype == "int8":
+            scales = np.maximum(np.abs(emb).max(axis=1), 1e-12) / 127.0
+            self.vectors = np.round(emb / scales[:, None]).astype(np.int8)
+            self.scales = scales.astype(np.float32)
+        else:
+            self.vectors = emb.astype(np.float16)
+            self.scales = np.ones(emb.shape[0], dtype=np.float32)
+
+    def search(self, q: np.ndarray, n: int) -> List[int]:
+        """
+        Approximate top-n vector indices by inner product with q.
+        """
+        if not len(self.members) or n <= 0:
+            return []
+        probe = np.argsort(-(self.centroids @ q), kind="stable")[: self.nprobe]
+        cand = np.concatenate([self.members[self.offsets[c]:self.offsets[c + 1]] for c in probe])
+        if not len(cand):
+            return []
+        scores = (self.vectors[cand].astype(np.float32) @ q) * self.scales[cand]
+        top = np.argsort(-scores, kind="stable")[:n]
+        return cand[top].tolist()
+
+
+class DenseStore:
+    """
+    Dense retriever over the same document list as a LocalBM25Store.
+
+    Exposes `rank(query, n)` returning document indices, so it can be fused
+    with BM25 rankings (see `HybridStore`).
+    """
+
+    def __init__(self, encoder: HashingSVDEncoder, index: IVFIndex):
+        self.encoder = encoder
+        self.index = index
+
+    @classmethod
+    def build(
+        cls,
+        docs: Sequence[dict],
+        dim: int = 128,
+        n_features: int = 2**14,
+        nprobe: int = 8,
+        dtype: str = "float16",
+    ) -> "DenseStore":
+        """
+        Fit the encoder and ANN index on document texts.
+        """
+        texts = [d.get("text", "") for d in docs]
+        encoder = HashingSVDEncoder(n_features=n_features, dim=dim).fit(texts)
+        index = IVFIndex(nprobe=nprobe, dtype=dtype).fit(encoder.encode(texts))
+        return cls(encoder, index)
+
+    def __len__(self) -> int:
+        return int(self.index.vectors.shape[0])
+
+    def rank(self, query: str, n: int) -> List[int]:
+        """
+        Indices of the (approximately) n nearest documents.
+        """
+        if not len(self):
+            return []
+        return self.index.search(self.encoder.encode([query])[0], n)
+
+    def save(self, path: Path) -> None:
+        """
+        Persist to a single .npz file.
+        """
+        ix = self.index
+        np.savez_compressed(
+            path,
+            n_features=self.encoder.n_features,
+            idf=self.encoder.idf,
+            components=self.encoder.components,
+            centroids=ix.centroids,
+            vectors=ix.vectors,
+            scales=ix.scales,
+            members=ix.members,
+            offsets=ix.offsets,
+            nprobe=ix.nprobe,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "DenseStore":
+        """
+        Load a store written by `save`.
+        """
+        with np.load(path) as z:
+            encoder = HashingSVDEncoder(n_features=int(z["n_features"]), dim=z["components"].shape[0])
+            encoder.idf = z["idf"]
+            encoder.components = z["components"]
+            vectors = z["vectors"]
+            index = IVFIndex(
+                n_lists=z["centroids"].shape[0],
+                nprobe=int(z["nprobe"]),
+                dtype="int8" if vectors.dtype == np.int8 else "float16",
+            )
+            index.centroids = z["centroids"]
+            index.vectors = vectors
+            index.scales = z["scales"]
+            index.members = z["members"]
+            index.offsets = z["offsets"]
+        return cls(encoder, index)
@@ -0,0 +1,66 @@
+from typing import Dict, List, Sequence
+
+from ragenetics.retrieval.dense import DenseStore
+from ragenetics.retrieval.vectorstore import LocalBM25Store
+
+
+def rrf_fuse(rankings: Sequence[Sequence[int]], k: int = 60) -> List[int]:
+    """
+    Reciprocal-rank fusion of several rankings of document indices.
+
+    Each document scores sum(1 / (k + rank)) over the rankings it appears in.
+
+    Args:
+        rankings: Rankings, best first.
+        k (int): RRF damping constant.
+
+    Returns:
+        List[int]: Fused ranking, best first (ties keep first-seen order).
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for r, i in enumerate(ranking):
+            scores[i] = scores.get(i, 0.0) + 1.0 / (k + r + 1)
+    return sorted(scores, key=lambda i: -scores[i])
+
+
+class HybridStore:
+    """
+    BM25 + dense retrieval fused with reciprocal-rank fusion.
+
+    Drop-in replacement for LocalBM25Store.similarity_search; both rankers
+    index the same document list, and the BM25 store's fuzzy de-dup is
+    applied to the fused ranking.
+    """
+
+    def __init__(self, bm25: LocalBM25Store, dense: DenseStore, depth: int = 50, rrf_k: int = 60):
+        """
+        Args:
+            bm25: Lexical store (owns the documents).
+            dense: Dense store built over the same documents.
+            depth (int): Candidates taken from each ranker before fusion.
+            rrf_k (int): RRF damping constant.
+        """
+        if len(dense) != len(bm25.docs):
+            raise ValueError(f"dense index has {len(dense)} vectors but BM25 store has {len(bm25.docs)} docs")
+        self.bm25 = bm25
+        self.dense = dense
+        self.depth = int(depth)
+        self.rrf_k = int(rrf_k)
+
+    @property
+    def docs(self):
+        return self.bm25.docs
+
+    def similarity_search(self, query: str, k: int = 6) -> List[str]:
+        """
+        Retrieve up to k passages by fused BM25 + dense rank, then de-dup.
+        """
+        if not self.bm25.docs:
+            return []
+        n = max(self.depth, k * 2)
+        # Only documents that match a query term get BM25 rank credit; the
+        # zero-score tail of a BM25 ranking is just corpus order
+        lexical = self.bm25.rank(query, n, positive=True)
+        fused = rrf_fuse([lexical, self.dense.rank(query, n)], k=self.rrf_k)
+        return self.bm25.dedup(fused, k)
@@ -0,0 +1,309 @@
+import heapq
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Postings per block; block-max scores and skips work at this granularity
+BLOCK_SIZE = 64
+
+# Slack for comparing float upper bounds with rounded scores
+_TOL = 1e-8
+
+
+def encode_varints(values: Sequence[int]) -> bytes:
+    """
+    LEB128-style varint encoding of non-negative integers.
+    """
+    out = bytearray()
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+    return bytes(out)
+
+
+def decode_varints(buf: bytes, count: int, pos: int = 0) -> Tuple[List[int], int]:
+    """
+    Decode `count` varints from `buf` starting at `pos`.
+
+    Returns:
+        (values, position after the last value)
+    """
+    out: List[int] = []
+    for _ in range(count):
+        v = shift = 0
+        while True:
+            b = buf[pos]
+            pos += 1
+            v |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        out.append(v)
+    return out, pos
+
+
+class PostingsList:
+    """
+    Block-partitioned, delta/varint-compressed postings for one term.
+
+    Each block stores doc-id gaps followed by term frequencies; per block we
+    keep the last doc id (for skipping) and the max BM25 contribution.
+    """
+
+    __slots__ = ("idf", "df", "blocks", "block_last", "block_len", "block_max", "max_score")
+
+    def __init__(self, idf: float):
+        self.idf = float(idf)
+        self.df = 0
+        self.blocks: List[bytes] = []
+        self.block_last: List[int] = []
+        self.block_len: List[int] = []
+        self.block_max: List[float] = []
+        self.max_score = 0.0
+
+    def add_block(self, docs: List[int], tfs: List[int], scores: List[float]) -> None:
+        prev = self.block_last[-1] if self.block_last else -1
+        gaps = [docs[0] - prev] + [b - a for a, b in zip(docs, docs[1:])]
+        self.blocks.append(encode_varints(gaps) + encode_varints(tfs))
+        self.block_last.append(docs[-1])
+        self.block_len.append(len(docs))
+        self.block_max.append(max(scores))
+        self.max_score = max(self.max_score, self.block_max[-1])
+        self.df += len(docs)
+
+    def decode_block(self, b: int) -> Tuple[List[int], List[int]]:
+        n = self.block_len[b]
+        gaps, pos = decode_varints(self.blocks[b], n)
+        tfs, _ = decode_varints(self.blocks[b], n, pos)
+        doc = self.block_last[b - 1] if b else -1
+        docs = []
+        for g in gaps:
+            doc += g
+            docs.append(doc)
+        return docs, tfs
+
+    def nbytes(self) -> int:
+        # Compressed payload plus 4-byte last-doc, 2-byte length and 4-byte max per block
+        return sum(len(b) for b in self.blocks) + 10 * len(self.blocks)
+
+
+class _Cursor:
+    """
+    Iterator over one term's postings with block skipping and lazy decoding.
+    """
+
+    __slots__ = ("pl", "weight", "ub", "block", "docs", "tfs", "pos", "doc", "index", "decoded")
+
+    END = 1 << 62
+
+    def __init__(self, pl: PostingsList, weight: int, index: "PostingsIndex"):
+        self.pl = pl
+        self.weight = weight
+        self.ub = pl.max_score * weight
+        self.index = index
+        self.decoded = 0
+        self.block = -1
+        self.docs: List[int] = []
+        self.tfs: List[int] = []
+        self.pos = 0
+        self.doc = -1
+        self.seek(0)
+
+    def _load(self, b: int) -> None:
+        self.block = b
+        self.docs, self.tfs = self.pl.decode_block(b)
+        self.decoded += len(self.docs)
+
+    def shallow_block(self, target: int) -> int:
+        """
+        Block that would contain `target`, found without decoding.
+        """
+        b = max(self.block, 0)
+        return bisect_left(self.pl.block_last, target, lo=b)
+
+    def seek(self, target: int) -> None:
+        """
+        Move to the first posting with doc >= target.
+        """
+        if self.doc >= target:
+            return
+        b = self.shallow_block(target)
+        if b >= len(self.pl.block_last):
+            self.doc = self.END
+            return
+        if b != self.block:
+            self._load(b)
+            self.pos = 0
+        self.pos = bisect_left(self.docs, target, lo=self.pos)
+        self.doc = self.docs[self.pos]
+
+    def score(self) -> float:
+        tf = self.tfs[self.pos]
+        return self.weight * self.pl.idf * tf * (self.index.k1 + 1) / (tf + self.index.norm[self.doc])
+
+
+class PostingsIndex:
+    """
+    Inverted index answering exact BM25 top-k with Block-Max WAND pruning.
+
+    Scores match rank_bm25's BM25Okapi (same idf, k1, b), so results agree
+    with exhaustive scoring while most postings of common terms are skipped
+    without being decoded. `stats` counts decoded postings and scored docs.
+
+    The index lives in memory only: it is built from the BM25 tables when a
+    store loads, and the serialized store holds just the documents.
+    """
+
+    def __init__(self, k1: float, b: float, norm: List[float], n_docs: int):
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.norm = norm
+        self.n_docs = int(n_docs)
+        self.lists: Dict[str, PostingsList] = {}
+        self.stats = {"queries": 0, "postings_decoded": 0, "docs_scored": 0}
+        # Queries may run concurrently (hedged voters share one store)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_bm25(cls, bm25, block_size: int = BLOCK_SIZE) -> "PostingsIndex":
+        """
+        Build from a fitted rank_bm25.BM25Okapi.
+        """
+        avgdl = bm25.avgdl or 1.0
+        norm = [bm25.k1 * (1 - bm25.b + bm25.b * dl / avgdl) for dl in bm25.doc_len]
+        index = cls(bm25.k1, bm25.b, norm, len(bm25.doc_len))
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for d, freqs in enumerate(bm25.doc_freqs):
+            for t, tf in freqs.items():
+                postings.setdefault(t, []).append((d, tf))
+
+        k1 = bm25.k1
+        for t, plist in postings.items():
+            pl = PostingsList(bm25.idf[t])
+            for s in range(0, len(plist), block_size):
+                chunk = plist[s:s + block_size]
+                docs = [d for d, _ in chunk]
+                tfs = [tf for _, tf in chunk]
+                scores = [pl.idf * tf * (k1 + 1) / (tf + norm[d]) for d, tf in chunk]
+                pl.add_block(docs, tfs, scores)
+            index.lists[t] = pl
+        return index
+
+    def nbytes(self) -> int:
+        """
+        Approximate in-memory size of the compressed postings.
+        """
+        return sum(pl.nbytes() for pl in self.lists.values())
+
+    def _count(self, decoded: int, scored: int) -> None:
+        with self._lock:
+            self.stats["queries"] += 1
+            self.stats["postings_decoded"] += decoded
+            self.stats["docs_scored"] += scored
+
+    def supports(self, terms: Sequence[str]) -> bool:
+        """
+        WAND needs non-negative contributions; tiny corpora can have negative idf.
+        """
+        return all(self.lists[t].idf >= 0 for t in terms if t in self.lists)
+
+    def top_n(self, terms: Sequence[str], n: int, decimals: int = 9, positive: bool = False) -> Optional[List[int]]:
+        """
+        Exact top-n doc ids by (-score, doc id), like a stable sort of all scores.
+
+        Documents without any query term (score 0) fill the tail in doc order,
+        unless `positive` is set.
+
+        Args:
+            terms: Query tokens (repeats weight the term, as in get_scores).
+            n: Number of doc ids to return.
+            decimals: Scores are rounded to this many decimals before ranking.
+            positive: Return only doc ids with a positive score.
+
+        Returns:
+            List[int] | None: Doc ids, or None if a term has negative idf.
+        """
+        if not self.supports(terms):
+            return None
+        n = min(n, self.n_docs)
+        if n <= 0:
+            self._count(0, 0)
+            return []
+
+        scale = 10.0**decimals
+        weights = Counter(t for t in terms if t in self.lists)
+        cursors = [_Cursor(self.lists[t], w, self) for t, w in weights.items()]
+        opened = cursors
+        cursors = [c for c in cursors if c.doc != _Cursor.END]
+        scored = 0
+
+        heap: List[Tuple[float, int]] = []  # (score, -doc); min-heap of current top-n
+        threshold = float("-inf")
+
+        while cursors:
+            cursors.sort(key=lambda c: c.doc)
+
+            # Pivot: first cursor where the summed upper bounds can beat the threshold
+            acc = 0.0
+            p = -1
+            for i, c in enumerate(cursors):
+                acc += c.ub
+                if acc > threshold - _TOL:
+                    p = i
+                    break
+            if p < 0:
+                break
+            pivot = cursors[p].doc
+            while p + 1 < len(cursors) and cursors[p + 1].doc == pivot:
+                p += 1
+
+            # Block-max check on the blocks that would hold the pivot; a cursor
+            # whose postings end before the pivot contributes nothing
+            block_ub = 0.0
+            nxt = cursors[p + 1].doc if p + 1 < len(cursors) else _Cursor.END
+            for c in cursors[: p + 1]:
+                b = c.shallow_block(pivot)
+                if b < len(c.pl.block_last):
+                    block_ub += c.pl.block_max[b] * c.weight
+                    nxt = min(nxt, c.pl.block_last[b] + 1)
+            if block_ub <= threshold - _TOL:
+                # No doc before the end of the shortest of these blocks can
+                # qualify; nxt > pivot since those blocks end at or after it
+                for c in cursors[: p + 1]:
+                    c.seek(nxt)
+            elif cursors[0].doc == pivot:
+                score = 0.0
+                for c in cursors[: p + 1]:
+                    score += c.score()
+                    c.seek(pivot + 1)
+                scored += 1
+                # Same rounding as np.round, so ties match exhaustive scoring
+                score = round(score * scale) / scale
+                if len(heap) < n:
+                    heapq.heappush(heap, (score, -pivot))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, -pivot))
+                if len(heap) == n:
+                    threshold = heap[0][0]
+            else:
+                for c in cursors[:p]:
+                    c.seek(pivot)
+
+            cursors = [c for c in cursors if c.doc != _Cursor.END]
+
+        self._count(sum(c.decoded for c in opened), scored)
+        ranked = sorted(((s, -d) for s, d in heap if s > 0), key=lambda x: (-x[0], x[1]))
+        out = [d for _, d in ranked]
+        if len(out) < n and not positive:
+            # Zero-score docs follow in corpus order, as in a stable sort
+            seen = set(out)
+            for d in range(self.n_docs):
+                if d not in seen:
+                    out.append(d)
+                    if len(out) >= n:
+                        break
+        return out
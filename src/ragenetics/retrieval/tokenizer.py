@@ -0,0 +1,118 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Sequence
+
+# One pass over lower-cased text. Alternatives are tried in order, so HPO ids
+# and HGVS notations (c.1521_1523delctt, p.(arg117his), c.1582g>a) survive as
+# single tokens instead of being split on their punctuation.
+TOKEN_RE = re.compile(
+    r"hp:\d{7}"
+    r"|\b[cgmnpr]\.(?:\([a-z0-9_>+*=\-]+\)|[a-z0-9_>+*=\-])+"
+    r"|[a-z0-9]+(?:[-'/][a-z0-9]+)*"
+)
+
+STOPWORDS: FrozenSet[str] = frozenset(
+    """
+    a an and are as at be but by for from has have in is it its of on or that the
+    this to was were which with
+    """.split()
+)
+
+
+def light_stem(word: str) -> str:
+    """
+    Harman's S-stemmer: fold plurals onto their singular.
+
+    Deliberately conservative: short words and non-alphabetic tokens (genes,
+    HGVS, HPO ids) are left alone.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if word.endswith("s") and not word.endswith(("us", "ss")):
+        return word[:-1]
+    return word
+
+
+class Tokenizer:
+    """
+    Regex tokenizer for indexing and queries, with optional light stemming
+    and stop-word removal.
+
+    Query tokenization is memoized, since every voter re-issues the same
+    question each decoding step.
+    """
+
+    def __init__(self, stem: bool = False, stopwords: bool = False, cache_size: int = 4096):
+        """
+        Args:
+            stem (bool): Apply `light_stem` to plain words.
+            stopwords (bool): Drop common English function words.
+            cache_size (int): Number of distinct queries to memoize.
+        """
+        self.stem = bool(stem)
+        self.stopwords = bool(stopwords)
+        self.cache_size = int(cache_size)
+        self._init_cache()
+
+    def _init_cache(self) -> None:
+        self._query_cache = lru_cache(maxsize=self.cache_size)(lambda text: tuple(self.tokenize(text)))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_query_cache", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_cache()
+
+    def _normalize(self, piece: str) -> List[str]:
+        toks = TOKEN_RE.findall(piece)
+        if self.stopwords:
+            toks = [t for t in toks if t not in STOPWORDS]
+        if self.stem:
+            toks = [light_stem(t) for t in toks]
+        return toks
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Split text into normalized tokens.
+        """
+        return self.tokenize_many([text])[0]
+
+    def tokenize_query(self, text: str) -> List[str]:
+        """
+        Cached `tokenize` for query strings.
+        """
+        return list(self._query_cache(text))
+
+    def tokenize_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """
+        Tokenize a batch of documents (used by the index builder).
+
+        No token spans whitespace, so each distinct whitespace-separated piece
+        is normalized once per batch and reused; corpus text repeats heavily.
+        """
+        pieces: Dict[str, List[str]] = {}
+        normalize = self._normalize
+        out = []
+        for text in texts:
+            toks: List[str] = []
+            for piece in text.lower().split():
+                norm = pieces.get(piece)
+                if norm is None:
+                    norm = pieces[piece] = normalize(piece)
+                toks += norm
+            out.append(toks)
+        return out
+
+    def to_config(self) -> Dict[str, Any]:
+        return {"stem": self.stem, "stopwords": self.stopwords}
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "Tokenizer":
+        return cls(stem=cfg.get("stem", False), stopwords=cfg.get("stopwords", False))
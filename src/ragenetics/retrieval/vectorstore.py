@@ -1,8 +1,17 @@
 import json
-from typing import Any, Dict, List, Sequence, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Optional
 
-from rank_bm25 import BM25Okapi
-from rapidfuzz import fuzz
+from ragenetics.retrieval.tokenizer import Tokenizer
+
+# rank_bm25 (and numpy with it) and rapidfuzz are imported on first use so
+# that importing the package stays cheap for short-lived CLI calls.
+if TYPE_CHECKING:
+    from rank_bm25 import BM25Okapi
+
+    from ragenetics.retrieval.postings import PostingsIndex
+
+# BM25 scores are compared after rounding to this many decimals
+SCORE_DECIMALS = 9
 
 
 class LocalBM25Store:
@@ -13,10 +22,25 @@ class LocalBM25Store:
       {"id": "<optional-id>", "text": "<document text>"}
     """
 
-    def __init__(self) -> None:
+    def __init__(self, tokenizer: Optional[Tokenizer] = None, wand: bool = False) -> None:
+        """
+        Args:
+            tokenizer: Tokenizer for documents and queries (default: Tokenizer()).
+            wand: Rank with block-max WAND over compressed postings instead of
+                exhaustive scoring. Opt-in: the pure-Python traversal only
+                pays off when queries let it skip most postings.
+        """
+        self.tokenizer = tokenizer or Tokenizer()
+        self.wand = bool(wand)
         self.docs: List[Dict[str, Any]] = []
         self.tokenized: List[List[str]] = []
-        self.bm25: Optional[BM25Okapi] = None
+        self.bm25: Optional["BM25Okapi"] = None
+        # Lazily built for similarity_search_many (see _ensure_matrix)
+        self._vocab: Optional[Dict[str, int]] = None
+        self._doc_term = None
+        self._idf = None
+        self._text_group = None
+        self._postings = None
 
     def build(self, docs: List[Dict[str, Any]]) -> "LocalBM25Store":
         """
@@ -28,9 +52,16 @@ class LocalBM25Store:
         Returns:
             self
         """
+        from rank_bm25 import BM25Okapi
+
         self.docs = docs or []
-        self.tokenized = [d.get("text", "").lower().split() for d in self.docs]
+        self.tokenized = self.tokenizer.tokenize_many([d.get("text", "") for d in self.docs])
         self.bm25 = BM25Okapi(self.tokenized) if self.tokenized else None
+        self._vocab = self._doc_term = self._idf = self._text_group = None
+        self._postings = None
+        if self.wand and self.bm25 is not None:
+            # Built up front so the first query does not pay for it
+            self._postings = self.postings
         return self
 
     def similarity_search(self, query: str, k: int = 6) -> List[str]:
@@ -47,9 +78,170 @@ class LocalBM25Store:
         if not self.docs or self.bm25 is None:
             return []
 
-        scores = self.bm25.get_scores(query.lower().split())
         # Over-fetch then dedupe
-        order = sorted(range(len(scores)), key=lambda i: -scores[i])[: max(1, k * 2)]
+        return self.dedup(self.rank(query, max(1, k * 2)), k)
+
+    def similarity_search_many(self, queries: Sequence[str], k: int = 6, chunk_size: int = 0) -> List[List[str]]:
+        """
+        Batch version of `similarity_search`, returning the same passages.
+
+        All queries are scored at once as a sparse product of a query-term
+        matrix with the BM25-weighted document-term matrix, in row chunks
+        sized so each dense score block stays around 16M floats.
+
+        Args:
+            queries: Query strings.
+            k: Max number of passages per query.
+            chunk_size: Queries per score block; 0 = derive from corpus size.
+
+        Returns:
+            List[List[str]]: One passage list per query.
+        """
+        if not self.docs or self.bm25 is None:
+            return [[] for _ in queries]
+        return [self.dedup(order, k) for order in self.rank_many(queries, max(1, k * 2), chunk_size)]
+
+    def rank_many(self, queries: Sequence[str], n: int, chunk_size: int = 0) -> List[List[int]]:
+        """
+        Batch version of `rank`: top-n document indices for each query, with
+        exact-duplicate texts collapsed to their best-ranked copy.
+        """
+        import numpy as np
+        from scipy import sparse
+
+        if not self.docs or self.bm25 is None:
+            return [[] for _ in queries]
+        self._ensure_matrix()
+
+        n_docs = len(self.docs)
+        n = min(n, n_docs)
+        chunk_size = chunk_size or max(1, (1 << 24) // n_docs)
+
+        # Query-term matrix: idf * term count, matching get_scores on repeated terms
+        rows, cols = [], []
+        for r, q in enumerate(queries):
+            for t in self.tokenizer.tokenize_query(q):
+                j = self._vocab.get(t)
+                if j is not None:
+                    rows.append(r)
+                    cols.append(j)
+        q_mat = sparse.csr_matrix(
+            (self._idf[cols] if cols else np.zeros(0), (rows, cols)),
+            shape=(len(queries), len(self._vocab)),
+        )
+        q_mat.sum_duplicates()
+
+        out: List[List[int]] = []
+        for start in range(0, len(queries), chunk_size):
+            block = np.round((q_mat[start:start + chunk_size] @ self._doc_term).toarray(), SCORE_DECIMALS)
+            out.extend(self._top_n(row, n) for row in block)
+        return out
+
+    def _top_n(self, scores, n: int) -> List[int]:
+        """
+        Exact top-n indices by (-score, index) without a full sort.
+        """
+        import numpy as np
+
+        # Index of the n-th largest score; everything above it is in, ties fill
+        # the remaining slots in corpus order, matching the stable sort in `rank`.
+        kth = np.partition(scores, len(scores) - n)[len(scores) - n]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[: n - len(above)]
+        idx = np.concatenate([above, tied])
+        # Unique texts first: exact duplicates would be dropped by dedup anyway
+        idx = idx[np.lexsort((idx, -scores[idx]))]
+        keep = np.unique(self._text_group[idx], return_index=True)[1]
+        return idx[np.sort(keep)].tolist()
+
+    def _ensure_matrix(self) -> None:
+        """
+        Build the (terms x docs) matrix of BM25 term weights without idf.
+        """
+        if self._doc_term is not None:
+            return
+        import numpy as np
+        from scipy import sparse
+
+        bm = self.bm25
+        vocab: Dict[str, int] = {t: j for j, t in enumerate(bm.idf)}
+        doc_len = np.asarray(bm.doc_len, dtype=float)
+        norm = bm.k1 * (1 - bm.b + bm.b * doc_len / bm.avgdl)
+
+        rows, cols, tfs = [], [], []
+        for d, freqs in enumerate(bm.doc_freqs):
+            for t, tf in freqs.items():
+                rows.append(vocab[t])
+                cols.append(d)
+                tfs.append(tf)
+        tf = np.asarray(tfs, dtype=float)
+        cols_arr = np.asarray(cols, dtype=np.int64)
+        weights = tf * (bm.k1 + 1) / (tf + norm[cols_arr])
+
+        self._vocab = vocab
+        self._idf = np.asarray([bm.idf[t] for t in vocab], dtype=float)
+        self._doc_term = sparse.csr_matrix((weights, (rows, cols_arr)), shape=(len(vocab), len(self.docs)))
+
+        # Group id per distinct stripped text, for cheap exact-duplicate removal
+        groups: Dict[str, int] = {}
+        self._text_group = np.asarray(
+            [groups.setdefault(d.get("text", "").strip(), len(groups)) for d in self.docs], dtype=np.int64
+        )
+
+    def rank(self, query: str, n: int, positive: bool = False) -> List[int]:
+        """
+        Indices of the n best documents by BM25 score (ties keep corpus order).
+
+        Args:
+            query: Query string.
+            n: Number of indices to return.
+            positive: Only return documents with a positive score, rather
+                than padding with non-matching ones (for rank fusion).
+
+        Returns:
+            List[int]: Document indices, best first.
+        """
+        if not self.docs or self.bm25 is None:
+            return []
+        terms = self.tokenizer.tokenize_query(query)
+        if self.wand:
+            order = self.postings.top_n(terms, n, decimals=SCORE_DECIMALS, positive=positive)
+            if order is not None:
+                return order
+
+        # Exhaustive scoring (also the WAND fallback: negative idf on tiny
+        # corpora breaks its bounds)
+        import numpy as np
+
+        # Rounded so mathematically tied scores stay tied whatever the summation
+        # order, keeping rank() and rank_many() in agreement
+        scores = np.round(self.bm25.get_scores(terms), SCORE_DECIMALS)
+        order = sorted(range(len(scores)), key=lambda i: -scores[i])[:n]
+        return [i for i in order if scores[i] > 0] if positive else order
+
+    @property
+    def postings(self) -> "PostingsIndex":
+        """
+        Compressed postings with block-max scores, built on first use.
+        """
+        if self._postings is None:
+            from ragenetics.retrieval.postings import PostingsIndex
+
+            self._postings = PostingsIndex.from_bm25(self.bm25)
+        return self._postings
+
+    def dedup(self, order: Sequence[int], k: int) -> List[str]:
+        """
+        Walk ranked document indices and keep up to k non-duplicate passages.
+
+        Args:
+            order: Document indices, best first.
+            k: Max number of passages to return.
+
+        Returns:
+            List[str]: Passages in rank order, skipping near-duplicates.
+        """
+        from rapidfuzz import fuzz
 
         picked: List[str] = []
         out: List[str] = []
@@ -69,14 +261,14 @@ class LocalBM25Store:
         """
         Serialize store to a JSON-serializable dict.
         """
-        return {"docs": self.docs}
+        return {"docs": self.docs, "tokenizer": self.tokenizer.to_config()}
 
     @classmethod
-    def deserialize(cls, obj: Dict[str, Any]) -> "LocalBM25Store":
+    def deserialize(cls, obj: Dict[str, Any], wand: bool = False) -> "LocalBM25Store":
         """
         Construct a store from a serialized dict produced by `serialize`.
         """
-        store = cls()
+        store = cls(Tokenizer.from_config(obj.get("tokenizer") or {}), wand=wand)
         docs = obj.get("docs", [])
         if not isinstance(docs, list):
             docs = []
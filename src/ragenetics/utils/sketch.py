@@ -0,0 +1,134 @@
+import math
+from typing import Any, Dict, Optional
+
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with bounded relative error (DDSketch).
+
+    Values are counted in logarithmic buckets of ratio gamma = (1+α)/(1-α),
+    so any quantile estimate is within a factor α of a value actually seen.
+    Sketches with the same α merge exactly by adding bucket counts, which
+    lets log segments be summarized independently and combined afterwards.
+
+    Memory is bounded by `max_bins`: when exceeded, the lowest buckets are
+    collapsed together, losing accuracy only at the bottom of the range.
+    Values at or below `min_value` (including negatives) share a zero bucket;
+    the metrics tracked here (ε, latency, token counts) are non-negative.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048, min_value: float = 1e-9):
+        """
+        Args:
+            relative_accuracy (float): Relative error bound α of quantiles.
+            max_bins (int): Maximum number of buckets kept.
+            min_value (float): Values at or below this count as zero.
+        """
+        self.relative_accuracy = float(relative_accuracy)
+        self.max_bins = int(max_bins)
+        self.min_value = float(min_value)
+        self.gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """
+        Count one value.
+        """
+        # Hot path: called per metric per log line, so avoid min()/max() calls
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.min_value:
+            self.zero += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        bins = self.bins
+        if key in bins:
+            bins[key] += 1
+        else:
+            bins[key] = 1
+            if len(bins) > self.max_bins:
+                self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = keys[: len(keys) - self.max_bins + 1]
+        into = keys[len(excess)]
+        self.bins[into] += sum(self.bins.pop(k) for k in excess)
+
+    def merge(self, other: "DDSketch") -> "DDSketch":
+        """
+        Add another sketch's counts into this one (in place).
+
+        Raises:
+            ValueError: If the sketches use different accuracies.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for k, c in other.bins.items():
+            self.bins[k] = self.bins.get(k, 0) + c
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero += other.zero
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimated q-quantile (0 <= q <= 1), or None if empty.
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return max(self.min, 0.0)
+        for k in sorted(self.bins):
+            seen += self.bins[k]
+            if rank < seen:
+                value = 2 * self.gamma ** k / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable state, e.g. for checkpoints.
+        """
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "min_value": self.min_value,
+            "bins": {str(k): c for k, c in self.bins.items()},
+            "zero": self.zero,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "DDSketch":
+        s = cls(d["relative_accuracy"], d["max_bins"], d["min_value"])
+        s.bins = {int(k): int(c) for k, c in d["bins"].items()}
+        s.zero = int(d["zero"])
+        s.count = int(d["count"])
+        s.sum = float(d["sum"])
+        if s.count:
+            s.min, s.max = float(d["min"]), float(d["max"])
+        return s
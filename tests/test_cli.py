@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ragenetics.cli import main
+
+HEAVY = ("numpy", "pandas", "scipy", "yaml", "loguru", "rank_bm25", "rapidfuzz", "openai", "pydantic")
+
+# Generous ceiling for importing the CLI module itself (microseconds)
+IMPORT_BUDGET_US = 150_000
+
+
+def _importtime(stmt: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    # Lines look like: "import time:   self [us] | cumulative | package"
+    out = {}
+    for line in r.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[1].isdigit():
+            out[parts[2]] = int(parts[1])
+    return out
+
+
+def test_cli_import_is_light():
+    """
+    Importing the CLI must not pull in heavy dependencies and must stay within budget.
+    """
+    times = _importtime("import ragenetics.cli")
+    loaded = {name.split(".")[0] for name in times}
+
+    assert not loaded.intersection(HEAVY)
+    assert times["ragenetics.cli"] < IMPORT_BUDGET_US
+
+
+def test_cli_help_exits_cleanly(capsys):
+    """
+    --help lists the subcommands without running anything.
+    """
+    with pytest.raises(SystemExit) as e:
+        main(["--help"])
+    assert e.value.code == 0
+    assert "run" in capsys.readouterr().out
+
+
+def test_serve_rejects_bad_numbers_with_400():
+    """
+    Non-numeric max_tokens or deadline is a client error, not a dropped connection.
+    """
+    import json
+    import threading
+    import urllib.error
+    import urllib.request
+    from http.server import ThreadingHTTPServer
+
+    from ragenetics.cli import serve_handler
+    from ragenetics.retrieval.vectorstore import LocalBM25Store
+
+    cfg = {
+        "llm": {"provider": "mock", "max_tokens": 2},
+        "privacy": {"scheme": "dp_vote", "m_voters": 3, "epsilon_per_vote": 0.5, "delta": 1e-6, "max_total_epsilon": 8.0},
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), serve_handler(cfg, LocalBM25Store()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+
+    def post(body):
+        req = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"), method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=10) as r:
+                return r.status, json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    try:
+        assert post({"query": "q", "max_tokens": "abc"})[0] == 400
+        assert post({"query": "q", "deadline": "soon"})[0] == 400
+        assert post({"query": "q", "max_tokens": [1]})[0] == 400
+        assert post(["q"])[0] == 400
+        status, out = post({"query": "q", "max_tokens": "1"})
+        assert status == 200 and out["eps_spent"] == 0.5
+    finally:
+        server.shutdown()
+        server.server_close()
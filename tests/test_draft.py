@@ -0,0 +1,56 @@
+import pytest
+
+from ragenetics.llm.draft import NGramDraftLLM
+from ragenetics.pipeline.builder import build_draft
+from ragenetics.pipeline.dp_sparse_rag import DPSparseVoteRAG
+
+
+class FixedGate:
+    def __init__(self, gate: bool):
+        self.gate = gate
+
+    def decide(self, score):
+        return self.gate, 0.1
+
+
+class AgreeVoter:
+    def agrees(self, q, prefix, candidate) -> bool:
+        return True
+
+    def propose_next(self, q, prefix="") -> str:
+        return "voted"
+
+
+def test_ngram_draft_follows_corpus():
+    draft = NGramDraftLLM(["likely pathogenic variant in brca1", "pathogenic variant in tp53"], n=3)
+
+    assert draft.sample_next_token("q", prefix="likely pathogenic", ctx=[]) == "variant"
+    # Retrieved (possibly private) context never shapes a proposal
+    assert draft.sample_next_token("q", prefix="", ctx=["ataxia telangiectasia"]) == "pathogenic"
+    assert draft.yesno("q", "pathogenic", "variant", ctx=[])
+
+
+def test_sparse_engine_tracks_acceptance():
+    draft = NGramDraftLLM(["a b c d e f"], n=2)
+    eng = DPSparseVoteRAG([AgreeVoter()], draft, epsilon_per_vote=0.5, svt=FixedGate(True), max_total_epsilon=10.0)
+    eng.generate("q", max_tokens=4)
+    assert eng.stats == {"steps": 4, "accepted": 4, "fallbacks": 0, "spans": 0}
+    assert eng.acceptance_rate == 1.0
+
+    eng = DPSparseVoteRAG([AgreeVoter()], draft, epsilon_per_vote=0.5, svt=FixedGate(False), max_total_epsilon=10.0)
+    text, _ = eng.generate("q", max_tokens=2)
+    assert text == "voted voted"
+    assert eng.acceptance_rate == 0.0
+
+
+def test_ngram_draft_needs_public_corpus(tmp_path):
+    cfg = {"privacy": {"svt": {"draft": "ngram"}}}
+    with pytest.raises(ValueError):
+        build_draft(cfg)
+
+    (tmp_path / "public.txt").write_text("likely pathogenic variant in brca1", encoding="utf-8")
+    cfg["privacy"]["svt"]["draft_corpus"] = str(tmp_path)
+    draft = build_draft(cfg)
+    assert draft.sample_next_token("q", prefix="likely pathogenic", ctx=[]) == "variant"
+    # Built once per corpus, not per engine
+    assert build_draft(cfg) is draft
@@ -0,0 +1,77 @@
+from ragenetics.pipeline.eval import entity_recall, evaluate_one, expand_sweep
+from ragenetics.retrieval.vectorstore import LocalBM25Store
+
+
+CFG = {
+    "llm": {"provider": "mock", "max_tokens": 4},
+    "retrieval": {"top_k": 2},
+    "privacy": {"scheme": "dp_vote", "m_voters": 3, "epsilon_per_vote": 0.5, "delta": 1e-6, "max_total_epsilon": 8.0},
+}
+
+
+def test_entity_recall_maps_phrases_and_variants():
+    """
+    HPO phrases count for their codes; variants match case-insensitively.
+    """
+    expected = {"genes": ["CFTR"], "hpo": ["HP:0001250"], "variants": ["c.35delG"]}
+    r = entity_recall(expected, "cftr variant c.35delg with seizures")
+    assert r == {"genes_recall": 1.0, "hpo_recall": 1.0, "variants_recall": 1.0}
+
+
+def test_evaluate_one_records_metrics():
+    """
+    A single evaluation row should carry latency, call, token and ε metrics.
+    """
+    store = LocalBM25Store().build([{"id": "a", "text": "CFTR variant c.35delG with seizures"}])
+    row = evaluate_one("small", CFG, {"query": "CFTR seizures"}, store=store)
+
+    assert row["tokens"] == 4
+    assert row["eps_spent"] == 2.0
+    assert row["llm_calls"] == 12
+    assert row["genes_recall"] is not None
+
+
+def test_expand_sweep_cross_product():
+    """
+    Sweeps expand into one named config per combination.
+    """
+    out = expand_sweep("small", CFG, ["privacy.epsilon_per_vote=0.25,1", "privacy.m_voters=2,4"])
+    assert len(out) == 4
+    assert out[0][1]["privacy"]["epsilon_per_vote"] == 0.25
+    assert CFG["privacy"]["epsilon_per_vote"] == 0.5
+
+
+def test_evaluate_one_records_input_tokens_per_answer():
+    """
+    input_tokens is the estimated prompt size of this answer's calls only.
+    """
+    from ragenetics.llm.prompts import estimate_tokens, next_token_prompt
+    from ragenetics.retrieval.rankers import heuristic_boost
+
+    store = LocalBM25Store().build([{"id": "a", "text": "CFTR variant c.35delG with seizures"}])
+    query = "CFTR seizures"
+    ctx = heuristic_boost(query, store.similarity_search(query, k=2))
+    for _ in range(2):
+        row = evaluate_one("small", CFG, {"query": query}, store=store)
+        words = row["answer"].split()
+        # 3 voters, one next-token prompt each per step, prefix = words so far
+        expected = sum(3 * estimate_tokens(next_token_prompt(query, " ".join(words[:i]), ctx)) for i in range(4))
+        assert row["input_tokens"] == expected
+
+
+def test_worker_store_follows_retrieval_options(tmp_path):
+    """
+    Configs that differ only in `retrieval.wand` get differently configured stores.
+    """
+    import json
+
+    from ragenetics.pipeline import eval as ev
+
+    idx = tmp_path / "bm25_index.json"
+    idx.write_text(json.dumps(LocalBM25Store().build([{"id": "a", "text": "CFTR seizures"}]).serialize()))
+    ev._init_worker(str(idx))
+    exhaustive = ev._worker_store(CFG)
+    wand = ev._worker_store({**CFG, "retrieval": {"top_k": 2, "wand": True}})
+
+    assert exhaustive is ev._worker_store(CFG)
+    assert not exhaustive.wand and wand.wand
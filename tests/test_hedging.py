@@ -0,0 +1,107 @@
+import threading
+import time
+
+from ragenetics.llm.hedging import HedgedExecutor
+
+
+def _straggler_calls(release: threading.Event, stragglers=(0,), n: int = 8):
+    """
+    `n` calls; the first attempt of each straggler blocks until `release`
+    is set, any retry returns at once.
+    """
+    attempts = []
+    lock = threading.Lock()
+
+    def call(i):
+        with lock:
+            attempts.append(i)
+            first = attempts.count(i) == 1
+        if i in stragglers and first:
+            release.wait(10)
+        return [i]
+
+    return [lambda i=i: call(i) for i in range(n)], attempts
+
+
+def _warm(ex: HedgedExecutor) -> None:
+    for _ in range(3):
+        ex.run([lambda: [0]] * 8)  # fast calls fill the latency history
+
+
+def test_hedging_answers_without_waiting_for_straggler():
+    ex = HedgedExecutor(max_workers=16, min_history=8)
+    _warm(ex)
+    release = threading.Event()
+    calls, attempts = _straggler_calls(release)
+
+    out = ex.run(calls)
+    # Returned while the straggler's first attempt was still blocked
+    assert not release.is_set()
+    release.set()
+
+    assert out == [[i] for i in range(8)]
+    assert attempts.count(0) == 2
+    assert ex.stats["hedges_won"] >= 1
+    assert ex.stats["hedges_issued"] >= ex.stats["hedges_won"]
+
+
+def test_hedges_only_use_free_pool_slots():
+    ex = HedgedExecutor(max_workers=6, min_history=8)
+    _warm(ex)
+
+    # A concurrent step whose calls (and their hedges) all block holds four slots
+    held = threading.Event()
+    other = threading.Thread(target=ex.run, args=([lambda: [held.wait(10)]] * 2,))
+    other.start()
+    deadline = time.monotonic() + 5
+    while ex.in_flight < 4 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert ex.in_flight == 4
+
+    # This step's own calls take the last two slots, so nothing is hedged and
+    # the stragglers are waited for
+    release = threading.Event()
+    calls, attempts = _straggler_calls(release, stragglers=(0, 1), n=2)
+    issued = ex.stats["hedges_issued"]
+    timer = threading.Timer(0.05, release.set)
+    timer.start()
+    out = ex.run(calls)
+    timer.join()
+    held.set()
+    other.join()
+
+    assert out == [[0], [1]]
+    assert ex.stats["hedges_issued"] == issued + 2  # the other step's two only
+    assert sorted(attempts) == [0, 1]
+
+
+def test_no_hedging_without_history():
+    ex = HedgedExecutor(max_workers=16, min_history=1000)
+    release = threading.Event()
+    calls, attempts = _straggler_calls(release)
+    timer = threading.Timer(0.05, release.set)
+    timer.start()
+
+    out = ex.run(calls)
+    timer.join()
+
+    assert out == [[i] for i in range(8)]
+    assert release.is_set() and attempts.count(0) == 1
+    assert ex.stats["hedges_issued"] == 0
+
+
+def test_quorum_engine_consults_fixed_subset():
+    from ragenetics.pipeline.dp_rag import DPVoteRAG
+
+    class Voter:
+        def propose_next(self, q, prefix="") -> str:
+            return "ok"
+
+    ex = HedgedExecutor(max_workers=4)
+    eng = DPVoteRAG([Voter() for _ in range(8)], 0.5, 1e-6, 2.0, executor=ex, quorum=3)
+    text, eps = eng.generate("q", max_tokens=4)
+
+    assert text == "ok ok ok ok"
+    assert eps == 2.0
+    assert eng.voters_per_step == 3
+    assert ex.stats["calls"] == 12
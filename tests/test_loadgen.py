@@ -0,0 +1,25 @@
+import time
+
+from ragenetics.pipeline.loadgen import poisson_arrivals, run_load, summarize_load
+
+
+def test_poisson_arrivals_match_rate():
+    arrivals = poisson_arrivals(rate=200.0, duration=10.0, seed=1)
+    assert 1800 < len(arrivals) < 2200
+    assert arrivals == sorted(arrivals) and arrivals[-1] < 10.0
+
+
+def test_open_loop_queues_when_saturated():
+    def handler(q):
+        time.sleep(0.02)
+        return {"tokens": 1, "eps_spent": 0.5, "ttft_s": 0.01}
+
+    # One worker can serve 50 req/s of 20 ms requests; at 100 req/s arrivals must queue, not slow down
+    records, depth = run_load(handler, ["a", "b"], rate=100.0, duration=0.5, workers=1, seed=3)
+    overall, windows = summarize_load(records, depth, 0.5, window=0.25)
+
+    assert overall["requests"] == len(records) and overall["errors"] == 0
+    assert overall["max_queue"] > 0
+    assert overall["latency_p99_s"] > 0.1
+    assert sum(w["completed"] for w in windows) == len(records)
+    assert overall["eps_per_s"] > 0
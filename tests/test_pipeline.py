@@ -24,3 +24,83 @@ def test_dp_vote_spends_epsilon():
 
     assert isinstance(text, str)
     assert eps > 0, "No ε was spent — privacy accounting failed"
+
+
+def test_dp_vote_stream_matches_generate():
+    """
+    generate_stream should yield tokens with a running ε total, one step at a time.
+    """
+    voters = [DummyVoter("ok") for _ in range(3)]
+    eng = DPVoteRAG(voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=1.0)
+
+    steps = list(eng.generate_stream("q", max_tokens=3))
+
+    assert [tok for tok, _ in steps] == ["ok", "ok"]
+    assert [eps for _, eps in steps] == [0.5, 1.0]
+
+
+def test_shared_voters_retrieve_once_per_step():
+    """
+    Voters sharing a retriever and model should trigger one retrieval and one
+    batched sampling call per step.
+    """
+    from ragenetics.llm.base import VoterLLM
+
+    class CountingStore:
+        def __init__(self):
+            self.calls = 0
+
+        def similarity_search(self, q, k=6):
+            self.calls += 1
+            return ["ctx"]
+
+    class BatchModel:
+        def __init__(self):
+            self.batches = []
+
+        def sample_next_tokens(self, q, prefix, ctx, n):
+            self.batches.append(n)
+            return ["ok"] * n
+
+    store, model = CountingStore(), BatchModel()
+    voters = [VoterLLM(store, model) for _ in range(4)]
+    eng = DPVoteRAG(voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=1.0)
+
+    text, _ = eng.generate("q", max_tokens=3)
+
+    assert text == "ok ok"
+    assert store.calls == 2
+    assert model.batches == [4, 4]
+
+
+def test_wave_voting_stops_early_and_charges_stop_test():
+    """
+    With unanimous voters, wave mode should stop after the first wave and
+    charge ε_vote + ε_stop per step.
+    """
+    voters = [DummyVoter("ok") for _ in range(40)]
+    eng = DPVoteRAG(
+        voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=100.0, wave_size=10, epsilon_stop=5.0, stop_margin=2
+    )
+
+    text, eps = eng.generate("q", max_tokens=5)
+
+    assert text == "ok ok ok ok ok"
+    assert eps == 5 * 5.5
+    assert eng.voters_per_step < 20
+
+
+def test_wave_stop_test_is_charged_when_no_token_is_released():
+    """
+    The stop test runs on the private votes, so its ε is charged even when
+    the step then ends the answer without a token.
+    """
+    voters = [DummyVoter("") for _ in range(40)]
+    eng = DPVoteRAG(
+        voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=100.0, wave_size=10, epsilon_stop=5.0, stop_margin=2
+    )
+    assert eng.generate("q", max_tokens=5) == ("", 5.0)
+
+    # Without a stop test nothing data-dependent was measured before the break
+    eng = DPVoteRAG(voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=100.0)
+    assert eng.generate("q", max_tokens=5) == ("", 0.0)
@@ -0,0 +1,23 @@
+from ragenetics.llm.prompts import estimate_tokens, next_token_prompt, truncate_context, yesno_prompt
+
+
+def test_prompts_share_static_prefix():
+    """
+    Prompts for the same question/context should differ only in their tail.
+    """
+    ctx = ["CFTR c.1521_1523delCTT reported.", "Seizures noted."]
+    a = next_token_prompt("q", "the", ctx)
+    b = yesno_prompt("q", "the variant", "is", ctx)
+
+    shared = "Question: q\nContext:\nCFTR c.1521_1523delCTT reported.\nSeizures noted.\n"
+    assert a.startswith(shared) and b.startswith(shared)
+
+
+def test_truncate_context_respects_budget():
+    """
+    Truncated context should never exceed the token budget.
+    """
+    ctx = ["word " * 50, "other " * 50]
+    out = truncate_context(ctx, 60)
+    assert sum(estimate_tokens(p) for p in out) <= 60
+    assert out[0] == ctx[0]
@@ -8,3 +8,105 @@ def test_empty_store():
     s = LocalBM25Store()
     out = s.similarity_search("x")
     assert out == []
+
+
+def test_hybrid_store_roundtrip(tmp_path):
+    """
+    A saved dense index reloads to the same ranking, and hybrid search returns passages.
+    """
+    from ragenetics.retrieval.dense import DenseStore
+    from ragenetics.retrieval.hybrid import HybridStore, rrf_fuse
+
+    docs = [
+        {"id": "a", "text": "Patient exhibits seizures and short stature. CFTR c.35delG."},
+        {"id": "b", "text": "Recurrent infections and diarrhea noted. BRCA1 c.68_69delAG."},
+        {"id": "c", "text": "Family history of hair abnormality. FBN1 c.1582G>A."},
+    ]
+    bm25 = LocalBM25Store().build(docs)
+    dense = DenseStore.build(docs, dim=2)
+    dense.save(tmp_path / "dense.npz")
+    loaded = DenseStore.load(tmp_path / "dense.npz")
+
+    assert loaded.rank("seizures CFTR", 3) == dense.rank("seizures CFTR", 3)
+    assert rrf_fuse([[0, 1], [1, 2]]) == [1, 0, 2]
+
+    out = HybridStore(bm25, loaded).similarity_search("seizures CFTR", k=2)
+    assert out and out[0].startswith("Patient exhibits seizures")
+
+    # A one-document corpus is too small for a truncated SVD
+    single = DenseStore.build(docs[:1])
+    assert single.rank("seizures CFTR", 3) == [0]
+
+
+def test_similarity_search_many_matches_loop():
+    """
+    Batch retrieval should return exactly what per-query search returns.
+    """
+    docs = [{"id": str(i), "text": t} for i, t in enumerate([
+        "CFTR variant with seizures",
+        "CFTR variant with seizures",
+        "BRCA1 variant and recurrent infections",
+        "short stature and seizures in the family",
+        "",
+        "PAH variant, diarrhea",
+    ])]
+    s = LocalBM25Store().build(docs)
+    queries = ["cftr seizures", "variant", "unknown words", "seizures seizures family"]
+
+    assert s.similarity_search_many(queries, k=3) == [s.similarity_search(q, k=3) for q in queries]
+
+
+def test_wand_top_n_matches_exhaustive():
+    """
+    Block-max WAND over compressed postings must return the exact BM25 ranking.
+    """
+    import random
+
+    import numpy as np
+
+    from ragenetics.retrieval.postings import PostingsIndex, decode_varints, encode_varints
+
+    assert decode_varints(encode_varints([0, 1, 127, 128, 300000]), 5)[0] == [0, 1, 127, 128, 300000]
+
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(400)]
+    weights = [1.0 / (r + 1) for r in range(len(vocab))]
+    docs = [{"text": " ".join(rng.choices(vocab, weights, k=30))} for _ in range(500)]
+    s = LocalBM25Store().build(docs)
+    index = PostingsIndex.from_bm25(s.bm25, block_size=8)
+
+    for _ in range(20):
+        terms = rng.choices(vocab, weights, k=4)
+        expected = np.argsort(-np.round(s.bm25.get_scores(terms), 9), kind="stable")[:10].tolist()
+        assert index.top_n(terms, 10) == expected
+    assert index.stats["postings_decoded"] > 0
+
+
+def test_wand_is_opt_in():
+    docs = [{"text": t} for t in ["cftr variant seizures", "brca1 variant", "short stature", "pah diarrhea"]]
+    plain = LocalBM25Store().build(docs)
+    wand = LocalBM25Store(wand=True).build(docs)
+
+    assert plain.rank("variant seizures", 3) == wand.rank("variant seizures", 3)
+    assert plain._postings is None
+    assert wand._postings is not None
+
+
+def test_hybrid_without_lexical_matches_follows_dense():
+    """
+    Non-matching documents get no BM25 credit in the fusion, so a query with
+    no BM25 hits is ranked by the dense index alone.
+    """
+    from ragenetics.retrieval.dense import DenseStore
+    from ragenetics.retrieval.hybrid import HybridStore
+
+    docs = [{"id": str(i), "text": f"report {i} " + " ".join(f"term{i * 7 + j}" for j in range(6))} for i in range(25)]
+    query = "ciliopathy"
+    for wand in (False, True):
+        bm25 = LocalBM25Store(wand=wand).build(docs)
+        dense = DenseStore.build(docs, dim=8)
+        assert bm25.rank(query, 10, positive=True) == []
+        assert len(bm25.rank(query, 10)) == 10
+
+        hybrid = HybridStore(bm25, dense, depth=10)
+        assert hybrid.similarity_search(query, k=5) == bm25.dedup(dense.rank(query, 10), 5)
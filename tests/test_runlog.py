@@ -0,0 +1,102 @@
+import gzip
+import json
+import random
+
+import numpy as np
+
+from ragenetics.pipeline.runlog import query_class, update
+from ragenetics.utils.sketch import DDSketch
+
+
+def _entry(i: int) -> dict:
+    return {
+        "query": "Is CFTR c.1521_1523del pathogenic?" if i % 2 else "What causes seizures?",
+        "config": "dp_small" if i % 3 else "dp_sparse",
+        "scheme": "dp_vote" if i % 3 else "dp_sparse_vote",
+        "eps_spent": 0.1 * (i % 40),
+        "latency_s": 0.01 * (1 + i % 100),
+        "ttft_s": None,
+        "tokens": 10,
+    }
+
+
+def _write(path, entries, mode="a"):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, mode + "t", encoding="utf-8") as f:
+        f.writelines(json.dumps(e) + "\n" for e in entries)
+
+
+def test_sketch_quantiles_are_relative_accurate_and_mergeable():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+    a, b = DDSketch(0.01), DDSketch(0.01)
+    for i, v in enumerate(values):
+        (a if i % 2 else b).add(v)
+    merged = DDSketch.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+
+    assert merged.count == len(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = float(np.quantile(values, q, method="lower"))
+        assert abs(merged.quantile(q) - exact) <= 0.02 * exact
+
+
+def test_query_class():
+    assert query_class("Is CFTR c.1521_1523del pathogenic?") == "variant"
+    assert query_class("BRCA1 testing indications") == "gene"
+    assert query_class("What causes seizures?") == "phenotype"
+    assert query_class("Tell me about the weather") == "other"
+
+
+def test_checkpoint_reads_only_new_lines_across_rotation(tmp_path):
+    log = tmp_path / "last_run.jsonl"
+    ckpt = tmp_path / "stats.ckpt"
+    entries = [_entry(i) for i in range(300)]
+    _write(log, entries[:100])
+    _write(tmp_path / "last_run.jsonl.2.gz", entries[200:250], "w")
+    with open(log, "a") as f:
+        f.write('{"partial": ')  # still being written
+
+    stats = update([log], checkpoint=ckpt, workers=0)
+    assert stats.runs == 150 and stats.malformed == 0
+
+    # Finish the partial line, rotate the live log into a compressed segment, start a new one
+    with open(log, "a") as f:
+        f.write('"x"}\n')
+    _write(log, entries[100:200])
+    with open(log, "rb") as src, gzip.open(tmp_path / "last_run.jsonl.1.gz", "wb") as dst:
+        dst.write(src.read())
+    _write(log, entries[250:300], "w")
+
+    stats = update([log], checkpoint=ckpt, workers=2)
+    assert stats.runs == 301
+    assert update([log], checkpoint=ckpt).runs == 301
+
+    rows = {(r["config"], r["scheme"]): r for r in stats.summary(by=("config", "scheme"))}
+    assert rows[("dp_small", "dp_vote")]["runs"] == 200
+    assert rows[("dp_sparse", "dp_sparse_vote")]["runs"] == 100
+    total = stats.summary(by=())[0]
+    assert abs(total["eps_spent_max"] - 3.9) < 1e-9
+    assert abs(total["eps_spent_mean"] - np.mean([e["eps_spent"] for e in entries])) < 1e-9
+    by_class = {r["class"]: r["runs"] for r in stats.summary(by=("class",))}
+    assert by_class == {"variant": 150, "phenotype": 150, "other": 1}
+
+
+def test_malformed_entries_and_checkpoint_pruning(tmp_path):
+    log = tmp_path / "last_run.jsonl"
+    ckpt = tmp_path / "stats.ckpt"
+    _write(log, [_entry(0), {"query": "q", "slo": "late"}, {"query": "q", "slo": {"slo_hit": True}}])
+    with open(log, "a") as f:
+        f.write("not json\n[1, 2]\n")
+        f.write('{"query": "q", "eps_spent": NaN}\n{"query": "q", "latency_s": Infinity}\n')
+    _write(tmp_path / "last_run.jsonl.1.gz", [_entry(1)], "w")
+
+    stats = update([log], checkpoint=ckpt, workers=0)
+    assert stats.runs == 3 and stats.malformed == 5
+    assert stats.summary(by=())[0]["slo_hit_rate"] == 1.0
+    assert len(json.loads(ckpt.read_text())["segments"]) == 2
+
+    # A rotated-away segment drops out of the checkpoint but stays counted
+    (tmp_path / "last_run.jsonl.1.gz").unlink()
+    stats = update([log], checkpoint=ckpt, workers=0)
+    assert stats.runs == 3
+    assert len(json.loads(ckpt.read_text())["segments"]) == 1
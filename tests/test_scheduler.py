@@ -0,0 +1,76 @@
+from ragenetics.pipeline.dp_rag import DPVoteRAG
+from ragenetics.pipeline.scheduler import DeadlineScheduler, StepPlan
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SlowVoter:
+    """
+    Voter whose call advances a fake clock instead of sleeping.
+    """
+
+    def __init__(self, clock: FakeClock, delay: float):
+        self.clock = clock
+        self.delay = delay
+
+    def propose_next(self, q, prefix="") -> str:
+        self.clock.now += self.delay
+        return "ok"
+
+
+def test_scheduler_degrades_in_stages():
+    sched = DeadlineScheduler(1.0, reduced_fraction=0.5, span_tokens=4)
+    sched.start(8)
+    assert sched.plan(100).stage == "full"  # nothing measured yet
+
+    sched.record(StepPlan("full", 8), 0.1)
+    assert sched.plan(5).stage == "full"
+    assert sched.plan(15) == StepPlan("reduced", 4)
+    assert sched.plan(100) == StepPlan("span", 4, 4)
+
+    sched.deadline_s = 0.0
+    assert sched.plan(1).stage == "stop"
+    assert sched.summary()["stopped_early"]
+
+
+def test_deadline_bounds_latency_and_keeps_accounting_exact():
+    clock = FakeClock()
+    voters = [SlowVoter(clock, 0.005) for _ in range(8)]
+    eng = DPVoteRAG(
+        voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=100.0, scheduler=DeadlineScheduler(clock=clock)
+    )
+
+    text, eps = eng.generate("q", max_tokens=50, deadline=0.25)
+    slo = eng.slo
+
+    assert slo["degraded"] and slo["stopped_early"]
+    # Never plans a step it does not expect to finish: at most one step over
+    assert slo["elapsed_s"] <= 0.25 + 8 * 0.005
+    assert eps == 0.5 * eng.stats["steps"]
+    assert 0 < len(text.split()) < 50
+
+
+def test_deadline_override_applies_to_one_answer_only():
+    clock = FakeClock()
+    voters = [SlowVoter(clock, 0.005) for _ in range(4)]
+    configured = DeadlineScheduler(10.0, clock=clock)
+    eng = DPVoteRAG(voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=1000.0, scheduler=configured)
+
+    short, _ = eng.generate("q", max_tokens=100, deadline=0.05)
+    assert eng.slo["deadline_s"] == 0.05 and len(short.split()) < 100
+
+    full, _ = eng.generate("q", max_tokens=100)
+    assert len(full.split()) == 100
+    assert eng.slo["deadline_s"] == 10.0 and not eng.slo["degraded"]
+    assert configured.deadline_s == 10.0
+
+    eng = DPVoteRAG(voters, epsilon_per_vote=0.5, delta=1e-6, max_total_epsilon=1000.0)
+    eng.generate("q", max_tokens=100, deadline=0.05)
+    text, _ = eng.generate("q", max_tokens=100)
+    assert len(text.split()) == 100 and eng.slo is None
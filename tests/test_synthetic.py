@@ -0,0 +1,34 @@
+import gzip
+
+from ragenetics.genetics.synthetic import ReportGenerator, generate_corpus
+from ragenetics.genetics.variant_utils import find_hgvs
+from ragenetics.retrieval.chunking import read_and_chunk_dir
+
+
+def test_shards_are_deterministic_and_readable(tmp_path):
+    a = generate_corpus(tmp_path / "a", 250, shard_size=100, workers=0, seed=5, vocab_size=500)
+    b = generate_corpus(tmp_path / "b", 250, shard_size=100, workers=0, seed=5, vocab_size=500)
+
+    assert [n for _, n in a] == [100, 100, 50]
+    for (pa, _), (pb, _) in zip(a, b):
+        with gzip.open(pa, "rt") as fa, gzip.open(pb, "rt") as fb:
+            assert fa.read() == fb.read()
+
+    docs = read_and_chunk_dir(tmp_path / "a", chunk_size=100000)
+    assert len(docs) == 250
+    assert docs[0]["id"].startswith("s00000-0000000:")
+
+
+def test_reports_carry_hgvs_and_near_duplicates():
+    gen = ReportGenerator(seed=1, shard=0, vocab_size=500, dup_rate=0.5)
+    reports = [gen.report(i) for i in range(200)]
+
+    originals = [r for r in reports if "near_duplicate_of" not in r]
+    assert 60 < len(originals) < 140
+    for r in originals[:20]:
+        assert set(r["hgvs"]) <= set(find_hgvs(r["text"]))
+    by_id = {r["id"]: r for r in reports}
+    dup = next(r for r in reports if "near_duplicate_of" in r)
+    src = by_id[dup["near_duplicate_of"]]
+    changed = sum(a != b for a, b in zip(dup["text"].split(" "), src["text"].split(" ")))
+    assert 0 <= changed <= 3 and dup["hgvs"] == src["hgvs"]
@@ -0,0 +1,23 @@
+from ragenetics.retrieval.tokenizer import Tokenizer, light_stem
+
+
+def test_tokenizer_keeps_hgvs_and_hpo_intact():
+    """
+    Punctuation around genes is stripped while HGVS and HPO ids stay whole.
+    """
+    toks = Tokenizer().tokenize("CFTR: c.1521_1523delCTT (p.Phe508del). HP:0004322, c.1582G>A.")
+    assert toks == ["cftr", "c.1521_1523delctt", "p.phe508del", "hp:0004322", "c.1582g>a"]
+
+
+def test_tokenizer_stem_and_stopwords():
+    """
+    Optional normalization shrinks inflections and drops function words.
+    """
+    tk = Tokenizer(stem=True, stopwords=True)
+    assert tk.tokenize("Seizures and recurrent infections in the family") == [
+        "seizure", "recurrent", "infection", "family",
+    ]
+    assert light_stem("brca1") == "brca1"
+    assert light_stem("seizure") == light_stem("seizures")
+    assert tk.tokenize_query("the infections") == tk.tokenize_query("the infections") == ["infection"]
+    assert tk.tokenize_many(["a b", "Infections."]) == [["b"], ["infection"]]